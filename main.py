@@ -1,10 +1,21 @@
 import logging
+import os
+import sys
 
 import pandas as pd
+from sqlalchemy import create_engine
 
-from src.models.models import Job
-from src.etl.extract import extract_from_jsearch, extract_from_pracuj
+from src.constants import DATABASE_URL
+from src.models.models import Job, jobs_to_columns
+from src.etl.extract import extract_from_jsearch, extract_from_pracuj, iter_from_pracuj
+from src.etl.load import renormalize_salaries
+from src.etl.pipeline import db_sink, run_streaming
 from src.etl.transform import clean_data
+from src.utils.dedupe_utils import NearDuplicateIndex
+from src.utils.driver_utils import close_driver
+from src.utils.index_utils import JobIndex
+from src.utils.load_utils import KnownUrls
+from src.utils.migration_utils import apply_migrations, ensure_partitions
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,12 +24,15 @@ def main():
     """Entrypoint. Useful to run python code locally."""
     # jsearch_results:list[Job] = extract_from_jsearch()
     logger.info("Finished jsearch_results")
-    pracujpl_results:list[Job] = extract_from_pracuj()
+    try:
+        pracujpl_results:list[Job] = extract_from_pracuj()
+    finally:
+        close_driver()
     logger.info("Finished extract_from_pracuj")
 
-    # Convert Job objects to dictionaries parsable by df
-    # data = [job.__dict__ for job in jsearch_results + pracujpl_results]
-    data = [job.__dict__ for job in pracujpl_results]
+    # Convert Job objects to column arrays parsable by df
+    # data = jobs_to_columns(jsearch_results + pracujpl_results)
+    data = jobs_to_columns(pracujpl_results)
     df = pd.DataFrame(data)
     df = clean_data(df)
     with pd.option_context('display.max_columns', None,
@@ -27,5 +41,48 @@ def main():
         print(df.head())
     df.to_csv("output.csv", index=False)
 
+def main_streaming(output: str = "output.csv", to_db: bool = False):
+    """
+    Streaming entrypoint: jobs are transformed in micro-batches and appended to the CSV as they are scraped.
+    Run with `python main.py --stream`.
+    With to_db (`python main.py --stream --db`) every micro-batch is committed to the jobs table at DATABASE_URL
+    instead, skipping the offers already loaded, and the recommendation index is refreshed after every batch
+    and saved once the stream ends.
+    """
+    if to_db:
+        engine = create_engine(DATABASE_URL)
+        apply_migrations(engine)
+        ensure_partitions(engine)
+        known_urls = KnownUrls.from_engine(engine)
+        index = JobIndex.from_engine(engine)
+        try:
+            total = run_streaming([iter_from_pracuj(known_urls=known_urls)],
+                                  db_sink(engine, index),
+                                  known_urls=known_urls,
+                                  near_duplicates=NearDuplicateIndex.from_engine(engine))
+        finally:
+            close_driver()
+            index.save()
+        logger.info(f"Finished streaming {total} jobs to the database")
+        return
+
+    if os.path.exists(output):
+        os.remove(output)
+
+    def append_to_csv(df: pd.DataFrame):
+        df.to_csv(output, mode='a', header=not os.path.exists(output), index=False)
+
+    try:
+        total = run_streaming([iter_from_pracuj()], append_to_csv)
+    finally:
+        close_driver()
+    logger.info(f"Finished streaming {total} jobs to {output}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--renormalize-salaries" in sys.argv[1:]:
+        # After CURRENCY_RATES or TAX_GROSS_FACTORS change, recompute the stored salaries
+        renormalize_salaries(create_engine(DATABASE_URL))
+    elif "--stream" in sys.argv[1:]:
+        main_streaming(to_db="--db" in sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import argparse
+import logging
+import time
+
+from sqlalchemy import create_engine
+
+from src.constants import DATABASE_URL, JOB_INDEX_SNAPSHOT_PATH, RECOMMEND_TOP_K
+from src.models.models import CandidateProfile
+from src.utils.index_utils import JobIndex
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def recommend(profile: CandidateProfile, k: int = RECOMMEND_TOP_K, index: JobIndex | None = None) -> list[dict]:
+    """
+    Top k job offers for the candidate profile.
+    Pass a long-lived JobIndex (e.g. JobIndex.from_engine()) to answer many queries,
+    by default the index snapshot is loaded from JOB_INDEX_SNAPSHOT_PATH.
+    """
+    if index is None:
+        index = JobIndex.load(JOB_INDEX_SNAPSHOT_PATH)
+    return index.search(profile, k)
+
+def main():
+    """
+    Recommendation entrypoint, e.g.
+    `python recommend.py --skills Python SQL Airflow --level mid --mode remote hybrid --min-salary 15000`
+    """
+    parser = argparse.ArgumentParser(description="Recommend the best-fitting job offers for a candidate profile.")
+    parser.add_argument('--skills', nargs='*', default=[], help="Technical keywords, see constants.SYSTEM_MESSAGE")
+    parser.add_argument('--level', help="junior, mid or senior")
+    parser.add_argument('--mode', nargs='*', default=[], help="remote, hybrid, office or mobile")
+    parser.add_argument('--min-salary', type=float, help="Monthly gross salary floor")
+    parser.add_argument('-k', type=int, default=RECOMMEND_TOP_K, help="Number of offers to return")
+    parser.add_argument('--offline', action='store_true', help="Use the index snapshot without refreshing it")
+    args = parser.parse_args()
+
+    if args.offline:
+        index = JobIndex.load(JOB_INDEX_SNAPSHOT_PATH)
+    else:
+        index = JobIndex.from_engine(create_engine(DATABASE_URL))
+    profile = CandidateProfile(skills=args.skills, level=args.level, mode=args.mode, min_salary=args.min_salary)
+
+    started = time.perf_counter()
+    offers = recommend(profile, args.k, index)
+    logger.info(f"Found {len(offers)} offers among {len(index)} in {(time.perf_counter() - started) * 1000:.1f} ms")
+    for n, offer in enumerate(offers, start=1):
+        print(f"{n}. [{offer['match']}] {offer['title']} - {offer['company']} {offer['url']}")
+
+if __name__ == "__main__":
+    main()
@@ -13,34 +13,5 @@ GRANT ALL PRIVILEGES ON DATABASE jobs_db TO airflow;
 \c jobs_db;
 GRANT ALL ON SCHEMA public TO airflow;
 
-CREATE TABLE IF NOT EXISTS jobs (
-    job_id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-
-    -- Core
-    title TEXT,
-    company TEXT,
-    location TEXT,
-    url TEXT UNIQUE NOT NULL, -- Natural key, always unique in practice
-    description TEXT,
-    added_date DATE,
-
-    -- Salary
-    sal_min NUMERIC,
-    sal_max NUMERIC,
-
-    -- Categorical
-    level TEXT[],
-    schedule TEXT[],
-    mode TEXT[],
-    contract TEXT[],
-    skills TEXT[],
-    requirements TEXT[],
-    responsibilities TEXT[],
-    benefits TEXT[],
-
-    -- ML/Ranking score
-    score FLOAT
-);
-
-CREATE INDEX idx_jobs_url ON jobs (url);
-CREATE INDEX idx_jobs_added_date ON jobs (added_date);
+-- The jobs schema is migration-managed: the numbered files in src/migrations are applied by the DAG's
+-- migrate_task, or by hand with `python -m src.utils.migration_utils`.
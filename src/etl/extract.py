@@ -1,23 +1,42 @@
 import logging
 import os
-import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
 
-from src.constants import JSEARCH_QUERY, PRACUJ_QUERY, TimePeriod
-from src.etl.transform import standardize_compensation
+from src.constants import (
+    JSEARCH_MAX_CONCURRENCY,
+    JSEARCH_MAX_RETRIES,
+    JSEARCH_PAGES,
+    JSEARCH_QUERIES,
+    JSEARCH_QUERY,
+    PRACUJ_FETCH_MODE,
+    PRACUJ_KEYWORDS,
+    PRACUJ_LOCATIONS,
+    PRACUJ_MAX_PAGES,
+    PRACUJ_USER_AGENT,
+    PRACUJ_WORKERS
+)
+from src.etl.transform import salary_fields
 from src.models.models import Job
+from src.utils.crawl_utils import CrawlFrontier, build_pracuj_queries
+from src.utils.driver_utils import ChromeSession, get_driver
+from src.utils.json_state_utils import job_from_json_state
 from src.utils.extract_utils import (
+    CATEGORY_MATCHER,
+    CATEGORY_TABLES,
+    OFFER_SPEC,
+    make_soup,
     extract_job_level,
-    extract_contract_type,
     extract_desc,
-    extract_mode,
-    extract_schedule,
     extract_compensation,
     extract_fmt_list_items,
     extract_benefits
@@ -26,186 +45,373 @@ from src.utils.extract_utils import (
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-chrome_options = Options()
-chrome_options.add_argument("--headless")
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-chrome_options.add_argument("--no-first-run")
-chrome_options.add_argument("--disable-extensions")
-chrome_options.add_argument("--disable-default-apps")
-chrome_options.add_argument("--incognito")
-temp_profile = tempfile.mkdtemp()
-chrome_options.add_argument(f"--user-data-dir={temp_profile}")
-driver = webdriver.Chrome(options=chrome_options)
-
-def extract_from_jsearch() -> list:
+def extract_from_jsearch(known_urls=None,
+                         queries: list[str] = JSEARCH_QUERIES,
+                         pages: int = JSEARCH_PAGES) -> list:
     """
     This function extracts Jobs using rapidapi Jsearch API. It utilizes Google Jobs.
+    Offers whose apply link is in known_urls (e.g. KnownUrls) are skipped.
     """
-    rapidapi_key = os.getenv('RAPIDAPI_KEY')
-    rapidapi_host = os.getenv('RAPIDAPI_HOST')
+    return list(iter_from_jsearch(known_urls, queries, pages))
 
-    url = f"https://{rapidapi_host}/search"
+def _get_jsearch_session() -> requests.Session:
+    """Pooled session for the JSearch API, transient errors and 429s are retried with backoff."""
+    session = requests.Session()
+    retry = Retry(
+        total=JSEARCH_MAX_RETRIES,
+        backoff_factor=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=('GET',),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=JSEARCH_MAX_CONCURRENCY)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'x-rapidapi-key': f"{os.getenv('RAPIDAPI_KEY')}",
+        'x-rapidapi-host': f"{os.getenv('RAPIDAPI_HOST')}"
+    })
+    return session
 
-    querystring = JSEARCH_QUERY
+def _fetch_jsearch_page(session: requests.Session, url: str, query: str, page: int) -> list[dict]:
     # Google is not supporting country: pl, however this does the trick for the most part.
+    params = dict(JSEARCH_QUERY, query=query, page=str(page), num_pages="1")
+    try:
+        response = session.get(url, params=params, timeout=10)
+    except requests.RequestException as e:
+        logger.error(f"Failed to retrieve data from {url} ({query}, page {page}). {e}")
+        return []
+    if response.status_code != 200:
+        logger.error(f"Failed to retrieve data from {url} ({query}, page {page}), status {response.status_code}.")
+        return []
+    try:
+        return response.json().get('data', [])
+    except (ValueError, AttributeError) as e:
+        # A 200 with a non-JSON (or non-object) body, e.g. a gateway error page
+        logger.error(f"Failed to decode the response of {url} ({query}, page {page}). {e}")
+        return []
+
+def _job_from_jsearch(job_data: dict) -> Job:
+    if job_data.get('job_highlights.Benefits'):
+        benefits = job_data.get('job_highlights.Benefits')
+    elif job_data.get('job_benefits'):
+        benefits = job_data.get('job_benefits')
+    else: benefits = []
+    min = job_data.get('job_min_salary') if job_data.get('job_min_salary') else None
+    max = job_data.get('job_max_salary') if job_data.get('job_max_salary') else None
+    period = job_data.get('job_salary_period') if job_data.get('job_salary_period') else None
+    compensation = None
+    if min and period:
+        compensation = {'min': min, 'max': max or min, 'period': period,
+                        'currency': job_data.get('job_salary_currency')}
+    return Job(
+        title = job_data.get('job_title'),
+        company = job_data.get('employer_name'),
+        description = job_data.get('job_description'),
+        location = job_data.get('job_location'),
+        level = [''], # might need to extract from the title
+        schedule = job_data.get('job_employment_type'),
+        mode = [''], # api doesn't provide field for that
+        contract = [''], # api doesn't provide field for that
+        responsibilities = job_data.get('job_highlights.Responsibilities'),
+        requirements = job_data.get('job_highlights.Qualifications'),
+        benefits = benefits,
+        url = job_data.get('job_apply_link'),
+        **salary_fields(compensation)
+    )
 
-    headers = {
-        'x-rapidapi-key': f"{rapidapi_key}",
-        'x-rapidapi-host': f"{rapidapi_host}"
-    }
-    response = requests.get(url, headers=headers, params=querystring, timeout=10)
-
-    if response.status_code == 200:
-        data = response.json().get('data', [])
-        jobs = []
-        for job_data in data:
-            if job_data.get('job_highlights.Benefits'):
-                benefits = job_data.get('job_highlights.Benefits')
-            elif job_data.get('job_benefits'):
-                benefits = job_data.get('job_benefits')
-            else: benefits = []
-            min = job_data.get('job_min_salary') if job_data.get('job_min_salary') else None
-            max = job_data.get('job_max_salary') if job_data.get('job_max_salary') else None
-            period = job_data.get('job_salary_period') if job_data.get('job_salary_period') else None
-            salary_range = standardize_compensation({'min': min, 'max': max, 'period': period}, TimePeriod.MONTHLY)
-            job = Job(
-                title = job_data.get('job_title'),
-                company = job_data.get('employer_name'),
-                description = job_data.get('job_description'),
-                location = job_data.get('job_location'),
-                level = [''], # might need to extract from the title
-                schedule = job_data.get('job_employment_type'),
-                mode = [''], # api doesn't provide field for that
-                contract = [''], # api doesn't provide field for that
-                responsibilities = job_data.get('job_highlights.Responsibilities'),
-                requirements = job_data.get('job_highlights.Qualifications'),
-                benefits = benefits,
-                sal_min = salary_range[0],
-                sal_max = salary_range[1],
-                url = job_data.get('job_apply_link')
-            )
-            jobs.append(job)
-            logger.info(f"Jsearch API: successfully added a job. Count: {len(jobs)}")
-        return jobs
-    else:
-        logger.error(f"Failed to retrieve data from {url}.")
-    return []
-
-def extract_from_pracuj() -> list:
+def iter_from_jsearch(known_urls=None,
+                      queries: list[str] = JSEARCH_QUERIES,
+                      pages: int = JSEARCH_PAGES) -> Iterator[Job]:
     """
-    Scrapes job postings data from pracuj.pl
+    Generator version of extract_from_jsearch(), yields jobs as the responses arrive.
+    Every (query, page) pair is requested concurrently through one pooled session,
+    at most JSEARCH_MAX_CONCURRENCY at a time to stay inside the RapidAPI quota.
+    Offers are deduplicated on job_apply_link across pages and queries.
     """
-    # Extract job postings from pracuj.pl
-    url = PRACUJ_QUERY
-    logger.info(f"Pracuj.pl: Running {url}")
+    url = f"https://{os.getenv('RAPIDAPI_HOST')}/search"
+    session = _get_jsearch_session()
+    seen_links = set()
+    count = 0
+    try:
+        with ThreadPoolExecutor(max_workers=JSEARCH_MAX_CONCURRENCY) as executor:
+            futures = [executor.submit(_fetch_jsearch_page, session, url, query, page)
+                       for query in queries for page in range(1, pages + 1)]
+            for future in as_completed(futures):
+                for job_data in future.result():
+                    link = job_data.get('job_apply_link')
+                    if link in seen_links:
+                        continue
+                    seen_links.add(link)
+                    if known_urls is not None and link in known_urls:
+                        logger.info(f"Jsearch API: skipping already loaded job {link}")
+                        continue
+                    count += 1
+                    logger.info(f"Jsearch API: successfully added a job. Count: {count}")
+                    yield _job_from_jsearch(job_data)
+    finally:
+        session.close()
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def _get_http_session() -> requests.Session:
+    """Process-wide requests.Session, its connection pool is sized for the offer worker pool."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(PRACUJ_WORKERS, 10))
+            _http_session.mount('https://', adapter)
+            _http_session.mount('http://', adapter)
+            _http_session.headers.update({'User-Agent': PRACUJ_USER_AGENT})
+        return _http_session
+
+def _http_get(url: str) -> str:
+    response = _get_http_session().get(url, timeout=10)
+    response.raise_for_status()
+    return response.text
+
+def _fetch_page_source(url: str, fetch_mode: str, local: threading.local, sessions: list, lock: threading.Lock) -> str:
+    """
+        Fetch the HTML of an offer page.
+        In 'selenium' mode every worker thread lazily starts and keeps its own Chrome session,
+        in 'http' mode the page is downloaded with a plain GET (no JS rendering).
+    """
+    if fetch_mode == 'http':
+        return _http_get(url)
+    session = getattr(local, 'session', None)
+    if session is None:
+        session = local.session = ChromeSession()
+        with lock:
+            sessions.append(session)
+    worker_driver = session.start()
+    worker_driver.get(url)
+    return worker_driver.page_source
+
+def _parse_offer(listing: dict, page_source: str) -> Job | None:
+    """
+        Parse a single offer page into a Job.
+        listing contains the fields already known from the results page (title, company, location, url).
+    """
+    job_url = listing['url']
+    job_title = listing['title']
+
+    job_seniority_level = job_contracts = job_office_mode = job_desc = None
+    job_time_schedule = job_responsibilities = job_requirements = job_benefits = None
+    job_compensation = None
+
+    # Every field of the offer page is looked up with its own precompiled selector, see ExtractionSpec
+    tags = OFFER_SPEC.apply(make_soup(page_source))
+    title_tag = tags['title']
+    if title_tag is None or job_title != title_tag.text.strip():
+        logger.error(f"Failed to retrieve more job details from {job_url}")
+        return None
+
+    # The level, contract, mode and schedule badges are classified by one compiled vocabulary matcher
+    badges = {}
+    for field in CATEGORY_TABLES:
+        try:
+            badges[field] = getattr(tags[field], 'text').strip()
+        except AttributeError as e:
+            if field == 'schedule':
+                logger.warning(f"Failed to extract work schedule from {job_url} , assuming full-time")
+            else:
+                logger.warning(f"Failed to extract {field} from {job_url} , {e}")
+    categories = CATEGORY_MATCHER.classify_all({field: text for field, text in badges.items() if field != 'level'})
+    job_seniority_level = extract_job_level(badges['level']) if 'level' in badges else None
+    job_contracts = categories.get('contract')
+    job_office_mode = categories.get('mode')
+    job_time_schedule = categories.get('schedule')
+
+    try:
+        raw_desc = tags['description']
+        job_desc = extract_desc(raw_desc)
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"Failed to extract job description from {job_url} , {e}")
+
+    try:
+        raw_comp_tag = tags['compensation']
+        job_compensation = extract_compensation(raw_comp_tag)
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"Failed to extract salary range from {job_url} , {e}")
 
-    driver.get(url)
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    try:
+        raw_resp_tags = tags['responsibilities']
+        if raw_resp_tags:
+            job_responsibilities = extract_fmt_list_items(raw_resp_tags.select('li'))
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"Failed to extract job responsibilities from {job_url} , {e}")
 
-    if soup:
-        jobs = []
-        # Keep only the div with listings
-        results = soup.find_all('div', {'data-test': ['positioned-offer', 'default-offer']})
+    try:
+        raw_reqs_tags = tags['requirements']
+        if raw_reqs_tags:
+            job_requirements = extract_fmt_list_items(raw_reqs_tags.select('li'))
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"Failed to extract job requirements from {job_url} , {e}")
 
+    try:
+        raw_benefits_list = tags['offered'] or tags['benefits']
+        if raw_benefits_list:
+            job_benefits = extract_benefits(raw_benefits_list)
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"Failed to extract job benefits from {job_url} , {e}")
 
-        for job in results:
-            job_company = job.find('h3', {'data-test':'text-company-name'}).text.strip()
-            job_loc = job.find('h4', {'data-test':'text-region'}).text.strip()
+    return Job(
+        title = job_title,
+        company = listing['company'],
+        location = listing['location'],
+        description = job_desc,
+        mode = job_office_mode,
+        contract = job_contracts,
+        level = job_seniority_level,
+        schedule = job_time_schedule,
+        responsibilities = job_responsibilities,
+        requirements = job_requirements,
+        benefits = job_benefits,
+        url = job_url,
+        **salary_fields(job_compensation)
+    )
+
+def _parse_listings(page_source: str, url: str) -> list[dict]:
+    """Parse the offer cards of a pracuj.pl results page into listing dicts."""
+    soup = make_soup(page_source)
+    # Keep only the div with listings
+    results = soup.find_all('div', {'data-test': ['positioned-offer', 'default-offer']})
+
+    listings = []
+    for job in results:
+        try:
             job_url = job.a.get('href').split('?')[0]
-            job_title = job.find('h2', {'data-test':'offer-title'}).text.strip()
-
-            job_seniority_level = job_contracts = job_office_mode = job_desc = None
-            job_time_schedule = job_responsibilities = job_requirements = job_benefits = None
-            job_salary_range = [None, None]
-            
-            if job_url is not None:
-                if job_url.startswith('https://pracodawcy.pracuj.pl/'):
-                    continue
-                logger.info(f"Pracuj.pl: Extracting job: {job_url}")
-                driver.get(job_url)
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                if job_title == soup.find('h1', {'data-scroll-id': 'job-title'}).text.strip(): # type: ignore
-                    try:
-                        level_tag = soup.select_one('li[data-scroll-id="position-levels"] div[data-test="offer-badge-title"]')
-                        job_seniority_level = extract_job_level(getattr(level_tag, 'text').lower())
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract job level from {job_url} , {e}")
-
-                    try:
-                        raw_contract_tag = soup.select_one('li[data-scroll-id="contract-types"] div[data-test="offer-badge-title"]')
-                        job_contracts = extract_contract_type(getattr(raw_contract_tag, 'text').lower())
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract contract type from {job_url} , {e}")
-
-                    try:
-                        raw_desc = soup.select_one('ul[data-test="text-about-project"]')
-                        job_desc = extract_desc(raw_desc)
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract job description from {job_url} , {e}")
-
-                    try:
-                        raw_mode_tag = soup.select_one('li[data-scroll-id="work-modes"] div[data-test="offer-badge-title"]')
-                        mode_list = list(getattr(raw_mode_tag, 'text').strip().lower().split(','))
-                        job_office_mode = extract_mode(mode_list)
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract work mode from {job_url} , {e}")
-                    try:
-                        raw_schedule_tag = soup.select_one('li[data-scroll-id="work-schedules"] div[data-test="offer-badge-title"]')
-                        schedule_list = list(getattr(raw_schedule_tag, 'text').strip().lower().split(','))
-                        job_time_schedule = extract_schedule(schedule_list) # type: ignore
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract work schedule from {job_url} , assuming full-time")
-
-                    try:
-                        raw_comp_tag = soup.select_one('div[data-test="section-salaryPerContractType"]')
-                        job_salary_range = extract_compensation(raw_comp_tag)
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract salary range from {job_url} , {e}")
-
-                    try:
-                        raw_resp_tags = soup.select_one('section[data-test="section-responsibilities"]')
-                        if raw_resp_tags:
-                            job_responsibilities = extract_fmt_list_items(raw_resp_tags.select('li'))
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract job responsibilities from {job_url} , {e}")
-
-                    try:
-                        raw_reqs_tags = soup.select_one('section[data-test="section-requirements"]')
-                        if raw_reqs_tags:
-                            job_requirements = extract_fmt_list_items(raw_reqs_tags.select('li'))
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract job requirements from {job_url} , {e}")
-
-                    try:
-                        raw_benefits_list = soup.select_one('section[data-test="section-offered"]') or \
-                                            soup.select_one('section[data-test="section-benefits"]')
-                        if raw_benefits_list:
-                            job_benefits = extract_benefits(raw_benefits_list)
-                    except (AttributeError, TypeError) as e:
-                        logger.warning(f"Failed to extract job benefits from {job_url} , {e}")
-
-                    jobs.append(
-                        Job(
-                            title = job_title,
-                            company = job_company,
-                            location = job_loc,
-                            description = job_desc,
-                            mode = job_office_mode,
-                            contract = job_contracts,
-                            level = job_seniority_level,
-                            schedule = job_time_schedule,
-                            sal_min = job_salary_range[0],
-                            sal_max = job_salary_range[1],
-                            responsibilities = job_responsibilities,
-                            requirements = job_requirements,
-                            benefits = job_benefits,
-                            url = job_url
-                        ))
-                else:
-                    logger.error(f"Failed to retrieve more job details from {job_url}")
-            logger.info(f"Successfully added a job. Count: {len(jobs)}")
-    else:
-        logger.error(f"Failed to retrieve data from {url}.")
-    driver.quit()
-    return jobs
+            listing = {
+                'title': job.find('h2', {'data-test':'offer-title'}).text.strip(),
+                'company': job.find('h3', {'data-test':'text-company-name'}).text.strip(),
+                'location': job.find('h4', {'data-test':'text-region'}).text.strip(),
+                'url': job_url
+            }
+        except (AttributeError, TypeError) as e:
+            logger.warning(f"Failed to parse a listing on {url} , {e}")
+            continue
+        if job_url.startswith('https://pracodawcy.pracuj.pl/'):
+            continue
+        listings.append(listing)
+    return listings
+
+def _crawl_listings(queries: list[str], max_pages: int, known_urls=None) -> Iterator[dict]:
+    """
+        Walk the results pages of every query and yield unique listings, a page at a time,
+        so their offers can be fetched while the next results page loads.
+        A query stops paginating when a page is empty or contains only already-known offers,
+        so overlapping queries don't cost extra navigations. Offers in known_urls count as already known.
+    """
+    driver = get_driver()
+    frontier = CrawlFrontier(known_urls)
+    for query in queries:
+        for page in range(1, max_pages + 1):
+            url = query.format(page=page)
+            logger.info(f"Pracuj.pl: Running {url}")
+            try:
+                driver.get(url)
+                page_listings = _parse_listings(driver.page_source, url)
+            except WebDriverException as e:
+                logger.error(f"Failed to retrieve data from {url}. {e}")
+                break
+            new_listings = frontier.add(page_listings)
+            logger.info(f"Pracuj.pl: {len(new_listings)} new out of {len(page_listings)} offers on {url}")
+            if not new_listings:
+                break
+            yield from new_listings
+    logger.info(f"Pracuj.pl: {len(frontier.listings)} unique offers found")
+
+def _ordered_map(executor: ThreadPoolExecutor, fn, items: Iterable, window: int) -> Iterator:
+    """
+        Like executor.map(), but pulls items lazily and keeps at most `window` of them in flight,
+        so a slow consumer doesn't make every result pile up in memory. Results keep the input order.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def extract_from_pracuj(workers: int = PRACUJ_WORKERS,
+                        fetch_mode: str = PRACUJ_FETCH_MODE,
+                        keywords: list[str] = PRACUJ_KEYWORDS,
+                        locations: list[str] = PRACUJ_LOCATIONS,
+                        max_pages: int = PRACUJ_MAX_PAGES,
+                        known_urls=None,
+                        queries: list[str] | None = None) -> list:
+    """
+    Scrapes job postings data from pracuj.pl
+    Results pages of every keyword/location combination are crawled and offer URLs are deduplicated,
+    while the offers found so far are fetched and parsed by a pool of workers.
+    Args:
+        workers (int): Number of concurrent detail-page fetchers (Chrome sessions in 'selenium' mode).
+        fetch_mode (str): 'selenium' to render offers in headless Chrome, 'http' for plain GET requests,
+            'json' to read the offer's embedded JSON state over HTTP, rendering it only when that fails.
+        keywords (list[str]): Search keywords, e.g. 'data engineer'.
+        locations (list[str]): Search locations, e.g. 'warszawa'.
+        max_pages (int): Upper bound of results pages visited per query.
+        known_urls: Offers already in the database (e.g. KnownUrls), they are never fetched.
+        queries (list[str] | None): Results URLs with a {page} placeholder, overrides keywords and locations.
+    Returns:
+        list: Job objects, in the order the offers were discovered.
+    """
+    return list(iter_from_pracuj(workers, fetch_mode, keywords, locations, max_pages, known_urls, queries))
+
+def iter_from_pracuj(workers: int = PRACUJ_WORKERS,
+                     fetch_mode: str = PRACUJ_FETCH_MODE,
+                     keywords: list[str] = PRACUJ_KEYWORDS,
+                     locations: list[str] = PRACUJ_LOCATIONS,
+                     max_pages: int = PRACUJ_MAX_PAGES,
+                     known_urls=None,
+                     queries: list[str] | None = None) -> Iterator[Job]:
+    """
+    Generator version of extract_from_pracuj(), yields jobs in crawl order as soon as they are parsed.
+    Results pages are crawled as the workers ask for more listings, so the first offers are fetched
+    before the last results page is visited. At most a few offers per worker are fetched ahead
+    of the consumer, so memory stays bounded.
+    """
+    # Extract job postings from pracuj.pl
+    queries = queries if queries is not None else build_pracuj_queries(keywords, locations)
+    listings = _crawl_listings(queries, max_pages, known_urls)
+
+    count = 0
+    local = threading.local()
+    sessions = []
+    lock = threading.Lock()
+
+    def process(listing: dict) -> Job | None:
+        logger.info(f"Pracuj.pl: Extracting job: {listing['url']}")
+        try:
+            if fetch_mode == 'json':
+                # One GET per offer, the page's embedded JSON state already holds every field
+                try:
+                    job = job_from_json_state(listing, _http_get(listing['url']))
+                    if job is not None:
+                        return job
+                    logger.info(f"Pracuj.pl: No JSON state in {listing['url']}, rendering it instead")
+                except requests.RequestException as e:
+                    logger.warning(f"Pracuj.pl: GET failed for {listing['url']}, rendering it instead. {e}")
+                page_source = _fetch_page_source(listing['url'], 'selenium', local, sessions, lock)
+            else:
+                page_source = _fetch_page_source(listing['url'], fetch_mode, local, sessions, lock)
+            return _parse_offer(listing, page_source)
+        except (WebDriverException, requests.RequestException) as e:
+            logger.error(f"Failed to fetch {listing['url']} , {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error while processing {listing['url']} , {e}")
+        return None
+
+    workers = max(1, workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for parsed in _ordered_map(executor, process, listings, window=workers * 2):
+                if parsed is not None:
+                    count += 1
+                    logger.info(f"Successfully added a job. Count: {count}")
+                    yield parsed
+    finally:
+        for session in sessions:
+            session.close()
@@ -1,32 +1,213 @@
+import io
+import json
+import logging
+
 import pandas as pd
 from pandas import DataFrame
-import logging
-import numpy as np
+
+from src.constants import SCORE_CHUNK_SIZE
+from src.etl.transform import COMPENSATION_FIELDS, normalize_salaries
 
 logger = logging.getLogger(__name__)
 
-def load_to_db(df: DataFrame, engine):
-    # Sometimes jobs are reposted or daily run catches the same job
-    # Exclude such jobs
-    with engine.connect() as conn:
-        existing_urls = pd.read_sql("SELECT url FROM jobs", conn)['url'].tolist()
-    df_filtered = df[~df['url'].isin(existing_urls)]
-
-
-    array_columns = ['requirements', 'responsibilities', 'level', 'schedule', 'mode', 'contract', 'benefits']
-    for col in array_columns:
-        # Use .apply() to convert each numpy array to a list
-        # Handle potential None values gracefully if they exist in your arrays
-        # The lambda checks if the value is iterable (like an array) before converting
-        df_filtered[col] = df_filtered[col].apply(
-            lambda x: list(x) if hasattr(x, '__iter__') and not isinstance(x, (str, bytes)) else x
-        )
-        # Ensure the column remains object dtype to hold lists
-        df_filtered[col] = df_filtered[col].astype(object)
-
-
-    if not df_filtered.empty:
-        df_filtered.to_sql('jobs', engine, if_exists='append', index=False, chunksize=1000)
-    else:
-        logging.info("No new jobs found to load.")
-    logging.info("DataFrame deployed to jobs_db table in the database.")
+ARRAY_COLUMNS = ['requirements', 'responsibilities', 'level', 'schedule', 'mode', 'contract', 'benefits']
+LOAD_COLUMNS = ['title', 'company', 'location', 'url', 'description', 'added_date',
+                'sal_min', 'sal_max', 'cluster_id'] + list(COMPENSATION_FIELDS.values()) + ARRAY_COLUMNS
+
+def load_to_db(df: DataFrame, engine, on_conflict: str = 'nothing') -> int:
+    """
+    Load the batch into the jobs table.
+    The batch is streamed with COPY into a temporary staging table and merged with set-based statements,
+    so the cost depends on the batch size only, not on the table history. jobs is partitioned by added_date,
+    url uniqueness is enforced by the job_urls registry (see src/migrations), and the keyword lookup tables
+    are updated for the loaded rows.
+    Args:
+        df (DataFrame): Transformed jobs.
+        engine: SQLAlchemy engine of the jobs database.
+        on_conflict (str): 'nothing' keeps rows already in the table (reposts, repeated daily runs),
+            'update' overwrites them with the new values, except added_date which places the row in its partition.
+    Returns:
+        int: Number of rows inserted or updated.
+    """
+    if on_conflict not in ('nothing', 'update'):
+        raise ValueError(f"on_conflict must be 'nothing' or 'update', got {on_conflict!r}")
+    if df.empty:
+        logger.info("No new jobs found to load.")
+        return 0
+
+    columns = [col for col in LOAD_COLUMNS if col in df.columns]
+    # Sometimes jobs are reposted or daily run catches the same job, keep the first one in the batch
+    df = df.drop_duplicates(subset=['url'])
+    buffer = io.StringIO()
+    for row in df[columns].itertuples(index=False, name=None):
+        buffer.write('\t'.join(
+            _copy_array(value) if col in ARRAY_COLUMNS else _copy_scalar(value)
+            for col, value in zip(columns, row)
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    column_list = ', '.join(columns)
+    # The registry decides the job id and the partition (added_date) of every new row
+    insert_columns = ['job_id', 'added_date'] + [col for col in columns if col != 'added_date']
+    insert_values = ['r.job_id', 'r.added_date'] + [f"s.{col}" for col in columns if col != 'added_date']
+
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"CREATE TEMP TABLE jobs_staging ON COMMIT DROP AS SELECT {column_list} FROM jobs WITH NO DATA"
+            )
+            cur.copy_expert(f"COPY jobs_staging ({column_list}) FROM STDIN", buffer)
+            cur.execute("CREATE TEMP TABLE jobs_loaded (job_id BIGINT, added_date DATE, url TEXT) ON COMMIT DROP")
+            if on_conflict == 'update':
+                updates = ', '.join(f"{col} = s.{col}" for col in columns if col not in ('url', 'added_date'))
+                cur.execute(f"""
+                    WITH updated AS (
+                        UPDATE jobs SET {updates}
+                        FROM jobs_staging s JOIN job_urls u USING (url)
+                        WHERE jobs.job_id = u.job_id AND jobs.added_date = u.added_date
+                        RETURNING jobs.job_id, jobs.added_date, jobs.url
+                    )
+                    INSERT INTO jobs_loaded SELECT * FROM updated
+                """)
+            cur.execute(f"""
+                WITH registered AS (
+                    INSERT INTO job_urls (url, job_id, added_date)
+                    SELECT url, nextval('jobs_job_id_seq'), {'COALESCE(added_date, CURRENT_DATE)' if 'added_date' in columns else 'CURRENT_DATE'}
+                    FROM jobs_staging
+                    ON CONFLICT (url) DO NOTHING
+                    RETURNING url, job_id, added_date
+                ), inserted AS (
+                    INSERT INTO jobs ({', '.join(insert_columns)})
+                    SELECT {', '.join(insert_values)}
+                    FROM jobs_staging s JOIN registered r USING (url)
+                    RETURNING job_id, added_date, url
+                )
+                INSERT INTO jobs_loaded SELECT * FROM inserted
+            """)
+            keyword_columns = [col for col in ARRAY_COLUMNS if col in columns]
+            if keyword_columns:
+                _sync_keywords(cur, keyword_columns, replace=on_conflict == 'update')
+            cur.execute("SELECT COUNT(*) FROM jobs_loaded")
+            loaded = cur.fetchone()[0]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    logger.info(f"Loaded {loaded} of {len(df)} jobs into the jobs table, {len(df) - loaded} already existed.")
+    return loaded
+
+def renormalize_salaries(engine, chunk_size: int = SCORE_CHUNK_SIZE) -> int:
+    """
+    Recompute sal_min/sal_max of the stored offers from their raw salary columns, e.g. after
+    CURRENCY_RATES or TAX_GROSS_FACTORS change. Every chunk is normalized column-wise with normalize_salaries(),
+    the results are written back with COPY into a temporary table and a single UPDATE ... FROM, as in score_jobs().
+    Offers loaded before the raw columns existed are left as they are. Run with `python main.py --renormalize-salaries`.
+    Returns:
+        int: Number of updated rows.
+    """
+    raw_columns = list(COMPENSATION_FIELDS.values())
+    conn = engine.raw_connection()
+    try:
+        buffer = io.StringIO()
+        normalized = 0
+        with conn.cursor(name='jobs_salaries') as cur:
+            cur.itersize = chunk_size
+            cur.execute(f"SELECT job_id, {', '.join(raw_columns)} FROM jobs WHERE sal_raw_min IS NOT NULL")
+            while rows := cur.fetchmany(chunk_size):
+                df = pd.DataFrame(rows, columns=['job_id'] + raw_columns)
+                sal_min, sal_max = normalize_salaries(df['sal_raw_min'], df['sal_raw_max'], df['sal_period'],
+                                                      df['sal_currency'], df['sal_tax'])
+                pd.DataFrame({'job_id': df['job_id'], 'sal_min': sal_min, 'sal_max': sal_max}).astype(
+                    {'sal_min': 'Int64', 'sal_max': 'Int64'}
+                ).to_csv(buffer, sep='\t', header=False, index=False, na_rep='\\N')
+                normalized += len(df)
+                logger.info(f"Normalized the salaries of {normalized} jobs")
+        if not normalized:
+            logger.info("No raw salaries to normalize.")
+            return 0
+        buffer.seek(0)
+
+        with conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE jobs_salaries (job_id BIGINT, sal_min NUMERIC, sal_max NUMERIC) ON COMMIT DROP")
+            cur.copy_expert("COPY jobs_salaries (job_id, sal_min, sal_max) FROM STDIN", buffer)
+            cur.execute(
+                "UPDATE jobs SET sal_min = s.sal_min, sal_max = s.sal_max "
+                "FROM jobs_salaries s WHERE jobs.job_id = s.job_id"
+            )
+            updated = cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    logger.info(f"Updated the salaries of {updated} jobs.")
+    return updated
+
+def _sync_keywords(cur, keyword_columns: list[str], replace: bool):
+    """
+    Update the keywords/job_keywords lookup tables for the rows in jobs_loaded.
+    Cells are split on commas and lowercased, as in the 004_keyword_lookup_tables migration.
+    """
+    if replace:
+        cur.execute("DELETE FROM job_keywords USING jobs_loaded l WHERE job_keywords.job_id = l.job_id")
+    categories = ', '.join(f"('{col}', s.{col})" for col in keyword_columns)
+    cur.execute(f"""
+        CREATE TEMP TABLE job_keyword_items ON COMMIT DROP AS
+        SELECT DISTINCT l.job_id, l.added_date, c.category, lower(btrim(kw)) AS keyword
+        FROM jobs_loaded l
+        JOIN jobs_staging s USING (url)
+        CROSS JOIN LATERAL (VALUES {categories}) AS c(category, items)
+        CROSS JOIN LATERAL unnest(c.items) AS item
+        CROSS JOIN LATERAL regexp_split_to_table(item, ',') AS kw
+        WHERE btrim(kw) <> ''
+    """)
+    cur.execute("""
+        INSERT INTO keywords (category, keyword)
+        SELECT DISTINCT category, keyword FROM job_keyword_items
+        ON CONFLICT (category, keyword) DO NOTHING
+    """)
+    cur.execute("""
+        INSERT INTO job_keywords (keyword_id, job_id, added_date)
+        SELECT k.keyword_id, i.job_id, i.added_date
+        FROM job_keyword_items i JOIN keywords k USING (category, keyword)
+        ON CONFLICT DO NOTHING
+    """)
+
+def _copy_escape(text: str) -> str:
+    """Escape a value for the COPY text format."""
+    return (text.replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+
+def _copy_scalar(value) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return '\\N'
+    return _copy_escape(str(value))
+
+def _copy_array(value) -> str:
+    """Render a list-like cell as a TEXT[] literal for COPY."""
+    if isinstance(value, str):
+        # Lists may arrive JSON-encoded, e.g. after flatten_lists()
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = [value]
+    if value is None:
+        return '\\N'
+    if isinstance(value, str) or not hasattr(value, '__iter__'):
+        if not isinstance(value, str) and pd.isna(value):
+            return '\\N'
+        value = [value]
+    items = []
+    for item in value:
+        if item is None:
+            items.append('NULL')
+        else:
+            items.append('"' + str(item).replace('\\', '\\\\').replace('"', '\\"') + '"')
+    return _copy_escape('{' + ','.join(items) + '}')
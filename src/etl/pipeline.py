@@ -0,0 +1,71 @@
+import logging
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator
+
+import pandas as pd
+
+from src.constants import STREAM_BATCH_SIZE
+from src.etl.load import load_to_db
+from src.etl.score import score_jobs
+from src.etl.transform import clean_data
+from src.models.models import Job, jobs_to_columns
+from src.utils.index_utils import JobIndex
+
+logger = logging.getLogger(__name__)
+
+def iter_batches(jobs: Iterable[Job], batch_size: int) -> Iterator[list[Job]]:
+    """Group a stream of jobs into lists of at most batch_size."""
+    iterator = iter(jobs)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+def jobs_to_df(jobs: list[Job]) -> pd.DataFrame:
+    """Convert Job objects to a DataFrame, one row per job."""
+    return pd.DataFrame(jobs_to_columns(jobs))
+
+def db_sink(engine, index: JobIndex | None = None) -> Callable[[pd.DataFrame], int]:
+    """
+    Sink that loads (and commits) every batch into the jobs table and scores the new rows.
+    When given a JobIndex, the newly loaded rows are added to it. Its snapshot isn't saved here,
+    the caller saves it once the stream ends: a snapshot missing the last batches is caught up
+    by JobIndex.from_engine().
+    """
+    def sink(df: pd.DataFrame) -> int:
+        loaded = load_to_db(df, engine)
+        if loaded:
+            score_jobs(engine, only_unscored=True)
+        if index is not None and loaded:
+            index.refresh(engine)
+        return loaded
+    return sink
+
+def run_streaming(sources: list[Iterable[Job]],
+                  sink: Callable[[pd.DataFrame], object],
+                  batch_size: int = STREAM_BATCH_SIZE,
+                  known_urls=None,
+                  near_duplicates=None) -> int:
+    """
+    Run the ETL as a stream of micro-batches.
+    Jobs are pulled from the extraction generators (e.g. iter_from_pracuj()) as they are parsed,
+    every batch_size jobs are cleaned and standardized with clean_data() and handed to sink,
+    so only one batch is held in memory and the first rows are loaded while the crawl is still running.
+    Args:
+        sources: Iterables of Job, consumed one after another.
+        sink: Called with every transformed batch, e.g. db_sink(engine).
+        batch_size (int): Number of jobs per micro-batch.
+        known_urls: Offers already in the database (e.g. KnownUrls), dropped by clean_data().
+        near_duplicates: NearDuplicateIndex of the loaded offers, shared by the batches so a batch
+            also drops the near-duplicates of the previous ones.
+    Returns:
+        int: Number of transformed rows handed to sink.
+    """
+    total = 0
+    for n, batch in enumerate(iter_batches(chain.from_iterable(sources), batch_size), start=1):
+        df = clean_data(jobs_to_df(batch), known_urls=known_urls, near_duplicates=near_duplicates)
+        if df.empty:
+            logger.info(f"Batch {n}: nothing left to load after cleaning")
+            continue
+        sink(df)
+        total += len(df)
+        logger.info(f"Batch {n}: {len(df)} jobs passed to the sink, {total} in total")
+    return total
@@ -0,0 +1,69 @@
+import io
+import logging
+
+import pandas as pd
+
+from src.constants import SCORE_CHUNK_SIZE
+from src.utils.score_utils import JobScorer
+
+logger = logging.getLogger(__name__)
+
+SCORE_COLUMNS = ['job_id', 'requirements', 'benefits', 'level', 'mode', 'contract', 'sal_min', 'sal_max']
+
+def score_jobs(engine, scorer: JobScorer | None = None, only_unscored: bool = False,
+               chunk_size: int = SCORE_CHUNK_SIZE) -> int:
+    """
+    Compute jobs.score for the stored offers.
+    Rows are streamed from a server-side cursor in chunks, every chunk is scored with one sparse
+    matrix-vector product, and all the scores are written back with COPY into a temporary table
+    and a single UPDATE ... FROM, so re-scoring the whole history after a model change stays cheap.
+    Args:
+        engine: SQLAlchemy engine of the jobs database.
+        scorer (JobScorer | None): Scoring model, defaults to JobScorer.load().
+        only_unscored (bool): Score only the rows without a score, e.g. the ones loaded by the last run.
+        chunk_size (int): Rows read from the database at a time.
+    Returns:
+        int: Number of updated rows.
+    """
+    scorer = scorer or JobScorer.load()
+    query = f"SELECT {', '.join(SCORE_COLUMNS)} FROM jobs"
+    if only_unscored:
+        query += " WHERE score IS NULL"
+
+    conn = engine.raw_connection()
+    try:
+        buffer = io.StringIO()
+        scored = 0
+        with conn.cursor(name='jobs_scoring') as cur:
+            cur.itersize = chunk_size
+            cur.execute(query)
+            while rows := cur.fetchmany(chunk_size):
+                df = pd.DataFrame(rows, columns=SCORE_COLUMNS)
+                pd.DataFrame({'job_id': df['job_id'], 'score': scorer.score(df)}).to_csv(
+                    buffer, sep='\t', header=False, index=False
+                )
+                scored += len(df)
+                logger.info(f"Scored {scored} jobs")
+        if not scored:
+            logger.info("No jobs to score.")
+            return 0
+        buffer.seek(0)
+
+        with conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE jobs_scores (job_id BIGINT, score FLOAT) ON COMMIT DROP")
+            cur.copy_expert("COPY jobs_scores (job_id, score) FROM STDIN", buffer)
+            cur.execute(
+                # One score_seq per run, JobIndex.refresh() re-reads the rows above the last one it applied
+                "UPDATE jobs SET score = jobs_scores.score, score_seq = (SELECT nextval('jobs_score_seq')) "
+                "FROM jobs_scores WHERE jobs.job_id = jobs_scores.job_id"
+            )
+            updated = cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    logger.info(f"Updated the score of {updated} jobs.")
+    return updated
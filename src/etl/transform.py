@@ -1,95 +1,208 @@
+import asyncio
 import json
 import logging
 import os
 from typing import Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
-from src.constants import TimePeriod
-from src.utils.transform_utils import ai_summarize_list, extract_sections, RateLimitedStandardizer
+from src.constants import CURRENCY_RATES, LLM_BATCH_SIZE, LLM_CONCURRENCY, TAX_GROSS_FACTORS, TimePeriod
+from src.utils.dedupe_utils import NearDuplicateIndex, cluster_id_for, offer_texts
+from src.utils.transform_utils import (
+    ai_summarize_list,
+    extract_sections,
+    get_section_splitter,
+    summarize_locally,
+    AsyncRateLimitedStandardizer,
+    RateLimitedStandardizer
+)
 
 logger = logging.getLogger(__name__)
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Drop rows with missing values, extract features from desc, and standardize compensation."""
+def clean_data(df: pd.DataFrame, known_urls=None, near_duplicates: NearDuplicateIndex | None = None) -> pd.DataFrame:
+    """
+    Drop rows with missing values, extract features from desc, and standardize compensation.
+    Rows whose url is in known_urls (e.g. KnownUrls) are dropped before any LLM call,
+    near-duplicates (the same offer from another source, or reposted under a new url) as well,
+    see drop_near_duplicates().
+    """
     df = df.drop_duplicates(subset=['url'])
     df = df.dropna(subset=['title', 'company','url'])
+    if known_urls is not None and not df.empty:
+        new_urls = known_urls.filter_new(df['url'].tolist())
+        logger.info(f"Dropping {len(df) - len(new_urls)} already loaded jobs")
+        df = df[df['url'].isin(new_urls)]
+    df = drop_near_duplicates(df, near_duplicates)
+    # drop_duplicates/filtering above already produced a new frame, the steps below work on it in place
     df = remove_empty_lists(df)
-    df = transform_missing_features(df)
-    df = standardize_features(df)
+    df = transform_missing_features(df, copy=False)
+    df = standardize_features(df, copy=False)
 
     return df
 
-def standardize_features(df: pd.DataFrame) -> pd.DataFrame:
+def drop_near_duplicates(df: pd.DataFrame, near_duplicates: NearDuplicateIndex | None = None) -> pd.DataFrame:
+    """
+    Group near-duplicate offers into clusters and keep one canonical row per cluster, in a cluster_id column.
+    Offers are looked up in the LSH index by their MinHash signature. The most complete row of a new cluster
+    is its canonical row and founds it, rows of a cluster already in near_duplicates (e.g.
+    NearDuplicateIndex.from_engine(), offers loaded on previous runs) are reposts and are dropped.
+    Without near_duplicates only the duplicates within df are detected.
+    """
+    if df.empty:
+        return df
+    index = near_duplicates if near_duplicates is not None else NearDuplicateIndex()
+    known_clusters = set(index.signatures)
+    signatures = index.hasher.signatures(offer_texts(df))
+    keys = index.band_keys(signatures)
+    urls = df['url'].to_numpy(dtype=object)
+    # Rows with more filled fields are visited first, so they become the canonical ones
+    order = np.argsort(-df.notna().sum(axis=1).to_numpy(), kind='stable')
+    cluster_ids = np.zeros(len(df), dtype=np.int64)
+    keep = np.zeros(len(df), dtype=bool)
+    for position in order:
+        cluster = index.query(signatures[position], keys[position])
+        if cluster is None:
+            cluster = cluster_id_for(urls[position])
+            index.insert(cluster, signatures[position], keys[position])
+            keep[position] = True
+        cluster_ids[position] = cluster
+
+    reposts = np.count_nonzero(np.isin(cluster_ids, list(known_clusters))) if known_clusters else 0
+    logger.info(f"Dropping {len(df) - keep.sum()} near-duplicate jobs, {reposts} of them already loaded")
+    df = df.assign(cluster_id=cluster_ids)
+    return df[keep]
+
+def standardize_features(df: pd.DataFrame,
+                         batch_size: int = LLM_BATCH_SIZE,
+                         concurrency: int = LLM_CONCURRENCY,
+                         copy: bool = True) -> pd.DataFrame:
     """
     Standardize the responsibilities, requirements and benefits in the DataFrame
-    by applying my_func to each relevant cell.
+    by summarizing each relevant cell into keywords.
+    Cells are packed, across rows and features, into batches of batch_size items per API call.
+    batch_size=1 sends one request per cell.
+    With concurrency > 1 the batches are sent by AsyncRateLimitedStandardizer, several requests in flight at once.
+    copy=False modifies df in place.
     """
-    df = df.copy()
+    if copy:
+        df = df.copy()
     features = ['requirements', 'responsibilities', 'benefits']
-    standardizer = RateLimitedStandardizer(rpm=15)
+    present = []
     for feature in features:
         if feature in df.columns:
+            present.append(feature)
+        else:
+            logger.warning(f"Column '{feature}' not found.")
+
+    if concurrency > 1:
+        return _standardize_features_async(df, present, max(1, batch_size), concurrency)
+
+    standardizer = RateLimitedStandardizer(rpm=15)
+    if batch_size <= 1:
+        for feature in present:
             logger.info(f"--- Standardizing column: {feature} ---")
             df[feature] = df[feature].apply(
                 lambda value: standardizer.process_value(value, feature)
             )
             logger.info(f"--- Finished standardizing column: {feature} ---")
-        else:
-            logger.warning(f"Column '{feature}' not found.")
+    else:
+        cells = [(idx, feature) for feature in present for idx in df.index]
+        for feature in present:
+            df[feature] = df[feature].astype(object)
+        logger.info(f"--- Standardizing {len(cells)} cells in batches of {batch_size} ---")
+        for start in range(0, len(cells), batch_size):
+            batch = cells[start:start + batch_size]
+            values = standardizer.process_batch([(df.at[idx, feature], feature) for idx, feature in batch])
+            for (idx, feature), value in zip(batch, values):
+                df.at[idx, feature] = value
+        logger.info(f"--- Finished standardizing columns: {', '.join(present)} ---")
+    if standardizer.cache is not None:
+        logger.info(f"LLM cache stats: {standardizer.cache.stats()}")
 
     return df
 
-def transform_missing_features(df: pd.DataFrame) -> pd.DataFrame:
+def _standardize_features_async(df: pd.DataFrame, features: list[str], batch_size: int, concurrency: int) -> pd.DataFrame:
+    """Fill the feature columns with AsyncRateLimitedStandardizer, all batches concurrently."""
+    standardizer = AsyncRateLimitedStandardizer(rpm=15, concurrency=concurrency)
+    cells = [(idx, feature) for feature in features for idx in df.index]
+    for feature in features:
+        df[feature] = df[feature].astype(object)
+    batches = [cells[start:start + batch_size] for start in range(0, len(cells), batch_size)]
+    logger.info(f"--- Standardizing {len(cells)} cells in {len(batches)} batches, {concurrency} in flight ---")
+
+    results = asyncio.run(standardizer.process_batches(
+        [[(df.at[idx, feature], feature) for idx, feature in batch] for batch in batches]
+    ))
+    for batch, values in zip(batches, results):
+        for (idx, feature), value in zip(batch, values):
+            df.at[idx, feature] = value
+    logger.info(f"--- Finished standardizing columns: {', '.join(features)} ---")
+    if standardizer.cache is not None:
+        logger.info(f"LLM cache stats: {standardizer.cache.stats()}")
+    return df
+
+def transform_missing_features(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Transform DataFrame by filling missing requirements, responsibilities, and benefits
     from the description field where missing using extract_features_from_desc.
+    Only the rows with a gap are visited, the results are written back column-wise.
 
-    
     Args:
         df: Input DataFrame with job posting data
-        
+        copy: Return a modified copy, False fills df in place
+
     Returns:
         DataFrame with filled missing values
     """
-    df = df.copy()
-    
-    missing_mask = df[['requirements', 'responsibilities', 'benefits']].isna().any(axis=1)
-    rows_to_process = df[missing_mask]
-    
-    if rows_to_process.empty:
+    features = ['requirements', 'responsibilities', 'benefits']
+    missing = df[features].isna()
+    missing_mask = missing.any(axis=1)
+    if not missing_mask.any():
         return df
-        
-    for idx in rows_to_process.index:
+    if copy:
+        df = df.copy()
+
+    rows_to_process = df[missing_mask]
+    # Split all the descriptions in one batch before summarizing row by row
+    sections = get_section_splitter().split_many(rows_to_process['description'])
+    extracted = {}
+    for idx, row in rows_to_process.iterrows():
         try:
             logger.warning(f"Row {idx} is missing requirements, responsibilities, or benefits")
-            features = extract_features_from_desc(rows_to_process.loc[idx])
-            
-            if pd.isna(df.at[idx, 'requirements']):
-                df.at[idx, 'requirements'] = features[0]
-            if pd.isna(df.at[idx, 'responsibilities']):
-                df.at[idx, 'responsibilities'] = features[1]
-            if pd.isna(df.at[idx, 'benefits']):
-                df.at[idx, 'benefits'] = features[2]
-                
+            features_from_desc = extract_features_from_desc(row, sections.at[idx])
+            if features_from_desc is not None:
+                extracted[idx] = features_from_desc
         except Exception as e:
             logger.error(f"Error processing row {idx}: {str(e)}")
-            continue
-            
+    if not extracted:
+        return df
+
+    filled = pd.DataFrame.from_dict(extracted, orient='index', columns=features, dtype=object)
+    for feature in features:
+        targets = missing.index[missing[feature]].intersection(filled.index)
+        if not targets.empty:
+            df[feature] = df[feature].astype(object)
+            df.loc[targets, feature] = filled.loc[targets, feature]
     return df
 
-def extract_features_from_desc(row: pd.Series) -> Optional[list]:
+def extract_features_from_desc(row: pd.Series, sections: Optional[dict] = None) -> Optional[list]:
     """
         This function verifies that responsibilities, requirements, and benefits fields are empty.
         If they are, attempt to extract the missing data from the description. 
         It uses extract_sections() to categorize the fields into the list sections.
-        For consistency sake, use ai_summarize_list() to summarize the items into keywords.
+        For consistency sake, summarize the items into keywords, with the local keyword matcher when it is
+        confident and ai_summarize_list() otherwise.
+        sections may hold the already split description, e.g. from SectionSplitter.split_many().
     """
     requirements = row['requirements']
     responsibilities = row['responsibilities']
     benefits = row['benefits']
 
-    sections = extract_sections(row['description'])
+    if sections is None:
+        sections = extract_sections(row['description'])
 
 
     if row['responsibilities'] is None:
@@ -98,7 +211,8 @@ def extract_features_from_desc(row: pd.Series) -> Optional[list]:
         if features:
             print(f'row {row.name}, Responsibilities: {features}')
             try:
-                result = ai_summarize_list(f'requirements {", ".join(features)}')
+                result = summarize_locally(features, 'requirements') or \
+                         ai_summarize_list(f'requirements {", ".join(features)}')
                 requirements = result.split(',') if result else []
             except Exception as e:
                 logger.error(f"Error summarizing responsibilities: {e}")
@@ -111,7 +225,8 @@ def extract_features_from_desc(row: pd.Series) -> Optional[list]:
         if features:
             print(f'row {row.name}, Reqs: {features}')
             try:
-                result = ai_summarize_list(f'requirements {", ".join(features)}')
+                result = summarize_locally(features, 'requirements') or \
+                         ai_summarize_list(f'requirements {", ".join(features)}')
                 responsibilities = result.split(',') if result else []
             except Exception as e:
                 logger.error(f"Error summarizing requirements: {e}")
@@ -124,7 +239,8 @@ def extract_features_from_desc(row: pd.Series) -> Optional[list]:
         if features:
             print(f'row {row.name}, Benefits: {features}')
             try:
-                result = ai_summarize_list(f'benefits {", ".join(features)}')
+                result = summarize_locally(features, 'benefits') or \
+                         ai_summarize_list(f'benefits {", ".join(features)}')
                 benefits = result.split(',') if result else []
             except Exception as e:
                 logger.error(f"Error summarizing benefits: {e}")
@@ -133,12 +249,86 @@ def extract_features_from_desc(row: pd.Series) -> Optional[list]:
 
     return [requirements, responsibilities, benefits]
 
+# Target period -> {salary period -> conversion factor}.
+# Covers the pracuj.pl ('godz.', 'mies.'), JSON-LD and JSearch ('HOUR', 'YEAR') spellings.
+PERIOD_CONVERSION = {
+    TimePeriod.HOURLY: {
+        'godz': 1, 'hr': 1, 'hour': 1,
+        'dzień': 1/8, 'day': 1/8,
+        'tydz': 1/40, 'week': 1/40,
+        'mies': 1/160, 'mth': 1/160, 'month': 1/160,
+        'rok': 1/2080, 'yr': 1/2080, 'year': 1/2080
+    },
+    TimePeriod.MONTHLY: {
+        'godz': 160, 'hr': 160, 'hour': 160,
+        'dzień': 20, 'day': 20,
+        'tydz': 4, 'week': 4,
+        'mies': 1, 'mth': 1, 'month': 1,
+        'rok': 1/12, 'yr': 1/12, 'year': 1/12
+    },
+    TimePeriod.YEARLY: {
+        'godz': 2080, 'hr': 2080, 'hour': 2080,
+        'dzień': 260, 'day': 260,
+        'tydz': 52, 'week': 52,
+        'mies': 12, 'mth': 12, 'month': 12,
+        'rok': 1, 'yr': 1, 'year': 1
+    }
+}
+
+# Raw compensation key -> Job field / jobs column, kept so the history can be renormalized, see renormalize_salaries()
+COMPENSATION_FIELDS = {'min': 'sal_raw_min', 'max': 'sal_raw_max', 'period': 'sal_period',
+                       'currency': 'sal_currency', 'tax': 'sal_tax'}
+
+def _normalize_label(label) -> str:
+    return str(label).strip().rstrip('.').strip().lower()
+
+def _lookup_factors(values, table: dict[str, float], default: float = 1.0) -> np.ndarray:
+    """
+    Map an array of labels (periods, currencies, tax kinds) to factors of table.
+    Labels are normalized once per distinct value, missing and unknown labels get default.
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object).ravel())
+    factors = np.array([table.get(_normalize_label(label), default) for label in uniques] + [default], dtype=float)
+    # factorize() marks missing labels with -1, which picks the trailing default
+    return factors[codes]
+
+def normalize_salaries(sal_min, sal_max, period, currency=None, tax=None,
+                       target: TimePeriod = TimePeriod.MONTHLY) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Columnar salary normalization: convert whole columns of salary ranges to gross amounts
+    in SALARY_CURRENCY per target period in one vectorized pass, e.g. the stored history in renormalize_salaries().
+    Single offers go through standardize_compensation() instead.
+    Args:
+        sal_min, sal_max: Array-likes of the range bounds, a missing maximum falls back to the minimum.
+        period: Salary periods, e.g. 'mies.', 'godz', 'YEAR'. Unknown periods are left unconverted.
+        currency: Currencies, see CURRENCY_RATES. None keeps the amounts as they are.
+        tax: Tax indications, see TAX_GROSS_FACTORS. None keeps the amounts as they are.
+        target: The intended target time period for the salary to transform into.
+    Returns:
+        tuple: (min, max) float arrays rounded to whole units, NaN where the minimum is missing.
+    """
+    sal_min = pd.to_numeric(np.asarray(sal_min, dtype=object).ravel(), errors='coerce').astype(float)
+    sal_max = pd.to_numeric(np.asarray(sal_max, dtype=object).ravel(), errors='coerce').astype(float)
+    sal_max = np.where(np.isnan(sal_max), sal_min, sal_max)
+
+    factor = _lookup_factors(period, PERIOD_CONVERSION[target])
+    if currency is not None:
+        factor = factor * _lookup_factors(currency, CURRENCY_RATES)
+    if tax is not None:
+        factor = factor * _lookup_factors(tax, TAX_GROSS_FACTORS)
+    # Rounded, truncating would turn float error (60199.99...) into a unit off
+    return np.rint(sal_min * factor), np.rint(sal_max * factor)
+
+def _lookup_factor(label, table: dict[str, float], default: float = 1.0) -> float:
+    return default if label is None else table.get(_normalize_label(label), default)
+
 def standardize_compensation(compensation: dict, period: TimePeriod) -> list[int]:
     """
-        Standardize the units of compensation field.
+        Standardize the units of compensation field of one offer with plain arithmetic,
+        see normalize_salaries() for whole columns.
         1. Make the time period uniform
         2. Adjust the salary to reflect that
-        3. Standardize the tax (net vs gross)
+        3. Standardize the currency and the tax (net vs gross)
         4. Adjust the column and trim of redundant data.
         ---
         compensation = {
@@ -150,49 +340,74 @@ def standardize_compensation(compensation: dict, period: TimePeriod) -> list[int
         }
         period: The intended target time period for the salary to transform into.
     """
-    period_conversion = {
-        TimePeriod.HOURLY: {
-            'godz': 1,
-            'hr': 1,
-            'mies': 1/160,
-            'mth': 1/160,
-            'rok': 1/2080,
-            'yr': 1/2080
-        },
-        TimePeriod.MONTHLY: {
-            'godz': 160,
-            'hr': 160,
-            'mies': 1,
-            'mth': 1,
-            'rok': 1/12,
-            'yr': 1/12
-        },
-        TimePeriod.YEARLY: {
-            'godz': 2080,
-            'hr': 2080,
-            'mies': 12,
-            'mth': 12,
-            'rok': 1,
-            'yr': 1
-        }
-    }
+    factor = (_lookup_factor(compensation.get('period'), PERIOD_CONVERSION[period])
+              * _lookup_factor(compensation.get('currency'), CURRENCY_RATES)
+              * _lookup_factor(compensation.get('tax'), TAX_GROSS_FACTORS))
+    min_salary = float(compensation['min'])
+    max_salary = float(compensation.get('max') or min_salary)
+    return [round(min_salary * factor), round(max_salary * factor)]
 
-    current_period = compensation['period'].strip().rstrip('.')
-    conversion_factor = period_conversion[period].get(current_period, 1)
-    
-    min_salary = int(compensation['min'] * conversion_factor)
-    max_salary = int(compensation.get('max', compensation['min']) * conversion_factor)
-    
-    return [min_salary, max_salary]
+def salary_fields(compensation: dict | None) -> dict:
+    """
+    Job salary fields of an offer's compensation: the raw values (COMPENSATION_FIELDS), stored so the history
+    can be renormalized when the rates change, and sal_min/sal_max, the monthly gross range.
+    """
+    if not compensation or not compensation.get('min'):
+        return {'sal_min': None, 'sal_max': None}
+    fields = {column: compensation.get(key) for key, column in COMPENSATION_FIELDS.items()}
+    fields['sal_min'], fields['sal_max'] = standardize_compensation(compensation, TimePeriod.MONTHLY)
+    return fields
+
+def _list_column_to_arrow(values: pd.Series) -> tuple[pa.ListArray | None, np.ndarray]:
+    """
+    Arrow list<string> view of a list column, cells that aren't lists become nulls.
+    Returns:
+        tuple: (the array, or None if some items aren't strings, boolean mask of the list cells)
+    """
+    objects = values.to_numpy(dtype=object)
+    is_list = np.fromiter((isinstance(value, list) for value in objects), dtype=bool, count=len(objects))
+    try:
+        array = pa.array(np.where(is_list, objects, None), type=pa.list_(pa.string()))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        array = None
+    return array, is_list
+
+# String escapes of json.dumps: backslash first, then quotes and the U+0000-U+001F control characters
+JSON_ESCAPES = [('\\', '\\\\'), ('"', '\\"'), ('\n', '\\n'), ('\r', '\\r'), ('\t', '\\t'),
+                ('\b', '\\b'), ('\f', '\\f')] + \
+               [(chr(code), f'\\u{code:04x}') for code in range(0x20) if chr(code) not in '\n\r\t\b\f']
+JSON_OTHER_CONTROL_CHARS = r'[\x00-\x08\x0b\x0c\x0e-\x1f]'
+
+def _json_encode_lists(array: pa.ListArray) -> pa.Array:
+    """
+    Sanitize every item (drop braces and '#', trim) and render each list as a JSON string,
+    all with Arrow compute kernels. Null cells become '[]'.
+    """
+    items = pc.list_flatten(array)
+    items = pc.utf8_trim_whitespace(pc.replace_substring_regex(items, pattern=r'[{}#]', replacement=''))
+    escapes = JSON_ESCAPES[:5]
+    if pc.any(pc.match_substring_regex(items, JSON_OTHER_CONTROL_CHARS)).as_py():
+        # Rare, the remaining control characters only cost a pass each when some item has one
+        escapes = JSON_ESCAPES
+    for char, escaped in escapes:
+        items = pc.replace_substring(items, pattern=char, replacement=escaped)
+    quoted = pc.binary_join_element_wise('"', items, '"', '')
+    offsets = pc.subtract(pc.fill_null(array.offsets, 0), array.offsets[0])
+    joined = pc.binary_join(pa.ListArray.from_arrays(offsets, quoted), ', ')
+    return pc.fill_null(pc.binary_join_element_wise('[', joined, ']', ''), '[]')
 
 def flatten_lists(df: pd.DataFrame) -> pd.DataFrame:
     list_columns = ['level', 'schedule', 'mode', 'contract', 'requirements', 'responsibilities', 'benefits']
     # Some columns contain nested structures, Xcom zealously converts them - causes nested list error.
+    # The DAG passes Parquet artifacts (src/utils/artifact_utils.py) instead, this is only needed for JSON/CSV exports.
     for col in list_columns:
-        # Ensure all entries are lists
+        array, _ = _list_column_to_arrow(df[col])
+        if array is not None:
+            # Non-list cells are nulls in the array and become '[]'
+            df[col] = pd.Series(_json_encode_lists(array).to_numpy(zero_copy_only=False), index=df.index, dtype=object)
+            continue
+        # Items that aren't plain strings (e.g. dicts) need the per-cell path
         df[col] = df[col].apply(lambda x: x if isinstance(x, list) else [])
-        
-        # Flatten nested structures and sanitize strings
         df[col] = df[col].apply(
             lambda lst: [
                 str(item)
@@ -211,5 +426,13 @@ def remove_empty_lists(df: pd.DataFrame) -> pd.DataFrame:
     array_columns = ['requirements', 'responsibilities', 'level', 'schedule', 'mode', 'contract', 'benefits']
     for col in array_columns:
         if col in df.columns:
-            df[col] = df[col].apply(lambda x: None if isinstance(x, list) and not x else x)
+            array, is_list = _list_column_to_arrow(df[col])
+            if array is not None:
+                empty = is_list & (pc.fill_null(pc.list_value_length(array), -1).to_numpy() == 0)
+            else:
+                empty = is_list & np.fromiter((not value for value in df[col].to_numpy(dtype=object)),
+                                              dtype=bool, count=len(df))
+            if empty.any():
+                df[col] = df[col].astype(object)
+                df.loc[empty, col] = None
     return df
@@ -0,0 +1,35 @@
+-- Baseline: the jobs table as scripts/init_db.sql used to create it.
+-- Idempotent, databases initialized by the old script are only brought up to date.
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+
+    -- Core
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    url TEXT UNIQUE NOT NULL, -- Natural key, always unique in practice
+    description TEXT,
+    added_date DATE,
+
+    -- Salary
+    sal_min NUMERIC,
+    sal_max NUMERIC,
+
+    -- Categorical
+    level TEXT[],
+    schedule TEXT[],
+    mode TEXT[],
+    contract TEXT[],
+    skills TEXT[],
+    requirements TEXT[],
+    responsibilities TEXT[],
+    benefits TEXT[],
+
+    -- ML/Ranking score
+    score FLOAT,
+
+    -- Near-duplicate cluster, the same offer from another source or reposted under a new url
+    cluster_id BIGINT
+);
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS cluster_id BIGINT;
@@ -0,0 +1,89 @@
+-- Rebuild jobs as a table partitioned by added_date, one partition per year plus a default one.
+-- A unique constraint of a partitioned table must contain the partition key, so url uniqueness
+-- across partitions moves to the job_urls registry, which also hands out the job ids.
+-- idx_jobs_url duplicated the UNIQUE (url) index and isn't recreated.
+
+DROP INDEX IF EXISTS idx_jobs_url;
+ALTER TABLE jobs RENAME TO jobs_unpartitioned;
+-- Free the names the new table takes: the identity sequence, the constraints and the indexes
+ALTER TABLE jobs_unpartitioned ALTER COLUMN job_id DROP IDENTITY IF EXISTS;
+ALTER TABLE jobs_unpartitioned DROP CONSTRAINT IF EXISTS jobs_pkey;
+ALTER TABLE jobs_unpartitioned DROP CONSTRAINT IF EXISTS jobs_url_key;
+DROP INDEX IF EXISTS idx_jobs_added_date;
+DROP INDEX IF EXISTS idx_jobs_cluster_id;
+
+-- Identity columns aren't supported on partitioned tables before PostgreSQL 17
+CREATE SEQUENCE jobs_job_id_seq AS BIGINT;
+
+CREATE TABLE jobs (
+    job_id BIGINT NOT NULL DEFAULT nextval('jobs_job_id_seq'),
+
+    -- Core
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    url TEXT NOT NULL,
+    description TEXT,
+    added_date DATE NOT NULL DEFAULT CURRENT_DATE,
+
+    -- Salary
+    sal_min NUMERIC,
+    sal_max NUMERIC,
+
+    -- Categorical
+    level TEXT[],
+    schedule TEXT[],
+    mode TEXT[],
+    contract TEXT[],
+    skills TEXT[],
+    requirements TEXT[],
+    responsibilities TEXT[],
+    benefits TEXT[],
+
+    -- ML/Ranking score
+    score FLOAT,
+
+    -- Near-duplicate cluster, the same offer from another source or reposted under a new url
+    cluster_id BIGINT,
+
+    PRIMARY KEY (job_id, added_date),
+    UNIQUE (url, added_date)
+) PARTITION BY RANGE (added_date);
+
+ALTER SEQUENCE jobs_job_id_seq OWNED BY jobs.job_id;
+
+DO $$
+BEGIN
+    FOR y IN 2025..2030 LOOP
+        EXECUTE format(
+            'CREATE TABLE jobs_%s PARTITION OF jobs FOR VALUES FROM (%L) TO (%L)',
+            y, make_date(y, 1, 1), make_date(y + 1, 1, 1)
+        );
+    END LOOP;
+END $$;
+CREATE TABLE jobs_default PARTITION OF jobs DEFAULT;
+
+CREATE INDEX idx_jobs_added_date ON jobs (added_date);
+CREATE INDEX idx_jobs_cluster_id ON jobs (cluster_id);
+
+-- Natural key registry: url -> the job id and partition of its row
+CREATE TABLE job_urls (
+    url TEXT PRIMARY KEY,
+    job_id BIGINT NOT NULL,
+    added_date DATE NOT NULL
+);
+
+INSERT INTO jobs (job_id, title, company, location, url, description, added_date, sal_min, sal_max,
+                  level, schedule, mode, contract, skills, requirements, responsibilities, benefits,
+                  score, cluster_id)
+SELECT job_id, title, company, location, url, description, COALESCE(added_date, CURRENT_DATE), sal_min, sal_max,
+       level, schedule, mode, contract, skills, requirements, responsibilities, benefits,
+       score, cluster_id
+FROM jobs_unpartitioned;
+
+INSERT INTO job_urls (url, job_id, added_date)
+SELECT url, job_id, added_date FROM jobs;
+
+SELECT setval('jobs_job_id_seq', COALESCE((SELECT max(job_id) FROM jobs), 0) + 1, false);
+
+DROP TABLE jobs_unpartitioned;
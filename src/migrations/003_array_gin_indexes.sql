@@ -0,0 +1,10 @@
+-- GIN indexes for array containment/overlap queries, e.g. mode @> '{remote}' or level && '{junior,mid}'.
+-- Created on the partitioned table, so every partition gets its own.
+CREATE INDEX IF NOT EXISTS idx_jobs_level_gin ON jobs USING GIN (level);
+CREATE INDEX IF NOT EXISTS idx_jobs_schedule_gin ON jobs USING GIN (schedule);
+CREATE INDEX IF NOT EXISTS idx_jobs_mode_gin ON jobs USING GIN (mode);
+CREATE INDEX IF NOT EXISTS idx_jobs_contract_gin ON jobs USING GIN (contract);
+CREATE INDEX IF NOT EXISTS idx_jobs_skills_gin ON jobs USING GIN (skills);
+CREATE INDEX IF NOT EXISTS idx_jobs_requirements_gin ON jobs USING GIN (requirements);
+CREATE INDEX IF NOT EXISTS idx_jobs_responsibilities_gin ON jobs USING GIN (responsibilities);
+CREATE INDEX IF NOT EXISTS idx_jobs_benefits_gin ON jobs USING GIN (benefits);
@@ -0,0 +1,38 @@
+-- Normalized keywords: one row per (category, keyword) and one link per job and keyword.
+-- Standardized cells hold comma-separated keywords ({"ETL, AWS"}), they are split and lowercased here,
+-- so "jobs requiring Kafka and Spark" is an index lookup in job_keywords. load_to_db() keeps them in sync.
+CREATE TABLE keywords (
+    keyword_id SERIAL PRIMARY KEY,
+    category TEXT NOT NULL, -- Source column: requirements, benefits, level, ...
+    keyword TEXT NOT NULL,
+    UNIQUE (category, keyword)
+);
+
+CREATE TABLE job_keywords (
+    keyword_id INT NOT NULL REFERENCES keywords,
+    job_id BIGINT NOT NULL,
+    added_date DATE NOT NULL,
+    PRIMARY KEY (keyword_id, job_id),
+    FOREIGN KEY (job_id, added_date) REFERENCES jobs (job_id, added_date) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_job_keywords_job ON job_keywords (job_id, added_date);
+
+CREATE TEMP TABLE job_keyword_items ON COMMIT DROP AS
+SELECT DISTINCT j.job_id, j.added_date, c.category, lower(btrim(kw)) AS keyword
+FROM jobs j
+CROSS JOIN LATERAL (VALUES
+    ('requirements', j.requirements), ('responsibilities', j.responsibilities), ('benefits', j.benefits),
+    ('skills', j.skills), ('level', j.level), ('schedule', j.schedule), ('mode', j.mode), ('contract', j.contract)
+) AS c(category, items)
+CROSS JOIN LATERAL unnest(c.items) AS item
+CROSS JOIN LATERAL regexp_split_to_table(item, ',') AS kw
+WHERE btrim(kw) <> '';
+
+INSERT INTO keywords (category, keyword)
+SELECT DISTINCT category, keyword FROM job_keyword_items;
+
+INSERT INTO job_keywords (keyword_id, job_id, added_date)
+SELECT k.keyword_id, i.job_id, i.added_date
+FROM job_keyword_items i
+JOIN keywords k USING (category, keyword);
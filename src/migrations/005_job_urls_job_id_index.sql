@@ -0,0 +1,2 @@
+-- Incremental refreshes of the known URLs snapshot read the registry rows above the last job id they saw
+CREATE INDEX IF NOT EXISTS idx_job_urls_job_id ON job_urls (job_id);
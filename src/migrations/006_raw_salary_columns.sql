@@ -0,0 +1,8 @@
+-- The salary as published, so sal_min/sal_max of stored offers can be recomputed when the currency rates or
+-- tax factors change (src/etl/load.py renormalize_salaries()). Offers loaded before stay NULL and keep their range.
+ALTER TABLE jobs
+    ADD COLUMN IF NOT EXISTS sal_raw_min NUMERIC,
+    ADD COLUMN IF NOT EXISTS sal_raw_max NUMERIC,
+    ADD COLUMN IF NOT EXISTS sal_period TEXT,
+    ADD COLUMN IF NOT EXISTS sal_currency TEXT,
+    ADD COLUMN IF NOT EXISTS sal_tax TEXT;
@@ -0,0 +1,30 @@
+-- 002 created the yearly partitions up to 2030. ensure_jobs_partition(year) creates a later one,
+-- migrate_task calls it for the current and the next year (ensure_partitions() in src/utils/migration_utils.py),
+-- so rows don't pile up in jobs_default.
+-- A partition can't be created while the default partition holds rows of its range, such rows are moved:
+-- they are deleted from jobs_default (their job_keywords links cascade) and inserted back with their links.
+CREATE OR REPLACE FUNCTION ensure_jobs_partition(year INT) RETURNS BOOLEAN AS $$
+DECLARE
+    partition_name TEXT := format('jobs_%s', year);
+    range_start DATE := make_date(year, 1, 1);
+    range_end DATE := make_date(year + 1, 1, 1);
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+    CREATE TEMP TABLE jobs_partition_moved AS
+        SELECT * FROM jobs_default WHERE added_date >= range_start AND added_date < range_end;
+    CREATE TEMP TABLE job_keywords_partition_moved AS
+        SELECT k.* FROM job_keywords k JOIN jobs_partition_moved j USING (job_id, added_date);
+    DELETE FROM jobs_default WHERE added_date >= range_start AND added_date < range_end;
+    EXECUTE format('CREATE TABLE %I PARTITION OF jobs FOR VALUES FROM (%L) TO (%L)',
+                   partition_name, range_start, range_end);
+    INSERT INTO jobs SELECT * FROM jobs_partition_moved;
+    INSERT INTO job_keywords SELECT * FROM job_keywords_partition_moved;
+    DROP TABLE jobs_partition_moved;
+    DROP TABLE job_keywords_partition_moved;
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_jobs_partition(y) FROM generate_series(2025, EXTRACT(YEAR FROM CURRENT_DATE)::INT + 1) AS y;
@@ -0,0 +1,5 @@
+-- Every score_jobs() run stamps the rows it scores with a new value of jobs_score_seq,
+-- so the recommendation index re-reads the scores that changed since its snapshot (JobIndex.refresh()).
+CREATE SEQUENCE IF NOT EXISTS jobs_score_seq AS BIGINT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS score_seq BIGINT;
+CREATE INDEX IF NOT EXISTS idx_jobs_score_seq ON jobs (score_seq);
@@ -1,5 +1,25 @@
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from operator import attrgetter
 
+_run_date = None
+
+def get_run_date() -> str:
+    """
+    Date stamp shared by every Job created in this run (UTC, YYYY-MM-DD).
+    Computed once instead of formatting the clock for every instance.
+    """
+    global _run_date
+    if _run_date is None:
+        _run_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    return _run_date
+
+def set_run_date(run_date: str | None):
+    """Override the run date, e.g. with the date of the Airflow run's data_interval_end. None resets it to today."""
+    global _run_date
+    _run_date = run_date
+
+@dataclass(slots=True, repr=False)
 class Job:
     """
     Represents a single job posting.
@@ -34,39 +54,55 @@ class Job:
         Maximum salary provided in the range. Represented in monthly salary.
     url : str
         The URL of the job posting, where every detail is accessible.
-    id : str
-        The unique identifier for the job, uses uuid4.
+    added_date : str
+        Date the job was scraped (YYYY-MM-DD), shared by the whole run. See get_run_date().
+    sal_raw_min, sal_raw_max : float
+        The salary range as published, before normalization.
+    sal_period, sal_currency, sal_tax : str
+        The published salary period, currency and tax indication. With the raw range, they let
+        renormalize_salaries() recompute sal_min/sal_max of stored offers. See transform.salary_fields().
+
+    Jobs are slotted dataclasses without a per-instance __dict__.
+    Use to_dict() or the bulk converters below (jobs_to_columns(), jobs_to_rows(), jobs_to_arrow()).
     """
-    def __init__(self,
-                 title:             str | None,
-                 company:           str | None,
-                 description:       str | None,
-                 location:          str | None,
-                 level:             list[str] | None,
-                 schedule:          list[str] | None,
-                 mode:              list[str] | None,
-                 contract:          list[str] | None,
-                 requirements:      list[str] | None,
-                 responsibilities:  list[str] | None,
-                 benefits:          list[str] | None,
-                 sal_min:           int | None,
-                 sal_max:           int | None,
-                 url:               str | None):
-        self.added_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        self.title = title
-        self.company = company
-        self.location = location if location else None
-        self.description = description if description else None
-        self.requirements = requirements if requirements else None
-        self.responsibilities = responsibilities if responsibilities else None
-        self.level = level if level else None
-        self.schedule = schedule if schedule else None
-        self.mode = mode if mode else None
-        self.contract = contract if contract else None
-        self.benefits = benefits if benefits else None
-        self.sal_min = sal_min if sal_min else None
-        self.sal_max = sal_max if sal_max else None
-        self.url = url
+    title:             str | None
+    company:           str | None
+    description:       str | None
+    location:          str | None
+    level:             list[str] | None
+    schedule:          list[str] | None
+    mode:              list[str] | None
+    contract:          list[str] | None
+    requirements:      list[str] | None
+    responsibilities:  list[str] | None
+    benefits:          list[str] | None
+    sal_min:           int | None
+    sal_max:           int | None
+    url:               str | None
+    added_date:        str = field(default_factory=lambda: get_run_date())
+    sal_raw_min:       float | None = None
+    sal_raw_max:       float | None = None
+    sal_period:        str | None = None
+    sal_currency:      str | None = None
+    sal_tax:           str | None = None
+
+    def __post_init__(self):
+        # Empty values are stored as None, so they become NULLs in the database
+        self.location = self.location if self.location else None
+        self.description = self.description if self.description else None
+        self.requirements = self.requirements if self.requirements else None
+        self.responsibilities = self.responsibilities if self.responsibilities else None
+        self.level = self.level if self.level else None
+        self.schedule = self.schedule if self.schedule else None
+        self.mode = self.mode if self.mode else None
+        self.contract = self.contract if self.contract else None
+        self.benefits = self.benefits if self.benefits else None
+        self.sal_min = self.sal_min if self.sal_min else None
+        self.sal_max = self.sal_max if self.sal_max else None
+
+    def to_dict(self) -> dict:
+        """Row of the job as a dict, keys in ROW_FIELDS order."""
+        return dict(zip(ROW_FIELDS, _row_getter(self)))
 
     def __repr__(self):
         return (
@@ -85,6 +121,64 @@ class Job:
             sal_min={self.sal_min},
             sal_max={self.sal_max},
             url={self.url},
-            added_date={self.added_date}
+            added_date={self.added_date},
+            sal_raw_min={self.sal_raw_min},
+            sal_raw_max={self.sal_raw_max},
+            sal_period={self.sal_period},
+            sal_currency={self.sal_currency},
+            sal_tax={self.sal_tax}
             )"""
         )
+
+
+# Column order of the jobs rows, matches the order jobs used to be serialized in, the raw salary fields last
+ROW_FIELDS = ('added_date', 'title', 'company', 'location', 'description', 'requirements', 'responsibilities',
+              'level', 'schedule', 'mode', 'contract', 'benefits', 'sal_min', 'sal_max', 'url',
+              'sal_raw_min', 'sal_raw_max', 'sal_period', 'sal_currency', 'sal_tax')
+_row_getter = attrgetter(*ROW_FIELDS)
+
+def jobs_to_rows(jobs) -> list[tuple]:
+    """Jobs as tuples in ROW_FIELDS order, e.g. for COPY or executemany."""
+    return [_row_getter(job) for job in jobs]
+
+def jobs_to_columns(jobs) -> dict[str, list]:
+    """
+    Jobs as column arrays, {field: [values]}, without building a dict per job.
+    pd.DataFrame(jobs_to_columns(jobs)) replaces pd.DataFrame([job.__dict__ for job in jobs]).
+    """
+    rows = jobs_to_rows(jobs)
+    if not rows:
+        return {name: [] for name in ROW_FIELDS}
+    return {name: list(column) for name, column in zip(ROW_FIELDS, zip(*rows))}
+
+def jobs_to_arrow(jobs):
+    """Jobs as a pyarrow Table with an explicit schema, list fields as list<string>."""
+    import pyarrow as pa
+
+    list_type = pa.list_(pa.string())
+    schema = pa.schema([
+        ('added_date', pa.string()), ('title', pa.string()), ('company', pa.string()),
+        ('location', pa.string()), ('description', pa.string()),
+        ('requirements', list_type), ('responsibilities', list_type), ('level', list_type),
+        ('schedule', list_type), ('mode', list_type), ('contract', list_type), ('benefits', list_type),
+        ('sal_min', pa.int64()), ('sal_max', pa.int64()), ('url', pa.string()),
+        ('sal_raw_min', pa.float64()), ('sal_raw_max', pa.float64()), ('sal_period', pa.string()),
+        ('sal_currency', pa.string()), ('sal_tax', pa.string()),
+    ])
+    columns = jobs_to_columns(jobs)
+    for name in ('requirements', 'responsibilities', 'level', 'schedule', 'mode', 'contract', 'benefits'):
+        # Some sources give a bare string instead of a list
+        columns[name] = [[value] if isinstance(value, str) else value for value in columns[name]]
+    return pa.Table.from_pydict(columns, schema=schema)
+
+@dataclass(slots=True)
+class CandidateProfile:
+    """
+    What a candidate is looking for, the input of the recommender (recommend.py).
+    skills are matched against the requirements keywords, level and mode against the job categories
+    (see constants.py), min_salary against the monthly sal_max of the offers.
+    """
+    skills:      list[str] = field(default_factory=list)
+    level:       str | None = None
+    mode:        list[str] = field(default_factory=list)
+    min_salary:  float | None = None
@@ -0,0 +1,99 @@
+import logging
+import os
+import pickle
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import pandas as pd
+
+from src.constants import ARTIFACT_DIR
+
+logger = logging.getLogger(__name__)
+
+ARRAY_COLUMNS = ['requirements', 'responsibilities', 'level', 'schedule', 'mode', 'contract', 'benefits']
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'wb'):
+    """
+    Open a temporary file next to path for writing and move it over path once the block succeeds.
+    Every writer gets a file of its own, so parallel tasks refreshing the same file don't write into
+    each other's, and readers see either the previous file or the complete new one.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f"{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def save_snapshot(obj, path: str):
+    """Pickle obj to path with atomic_write()."""
+    with atomic_write(path) as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_snapshot(cls, path: str):
+    """Unpickle a snapshot written by save_snapshot(), raising TypeError unless it holds a cls of cls.VERSION."""
+    with open(path, 'rb') as f:
+        obj = pickle.load(f)
+    if not isinstance(obj, cls) or getattr(obj, 'version', 1) != cls.VERSION:
+        raise TypeError(f"{path} doesn't hold a {cls.__name__} version {cls.VERSION}")
+    return obj
+
+def load_or_create_snapshot(cls, path: str):
+    """The snapshot at path, or a new empty cls() when it's missing, unreadable or of another version."""
+    if os.path.exists(path):
+        try:
+            return load_snapshot(cls, path)
+        except (OSError, pickle.UnpicklingError, TypeError, AttributeError, EOFError) as e:
+            logger.warning(f"Failed to read {cls.__name__} snapshot {path}, rebuilding it. {e}")
+    return cls()
+
+def _run_dir(run_id: str) -> str:
+    # Airflow run ids contain ':' and '+', keep the directory name portable
+    return os.path.join(ARTIFACT_DIR, re.sub(r'[^\w.-]', '_', run_id))
+
+def _to_list(value):
+    """Coerce a list-like cell to list[str] (or None) so the column has a single Arrow type."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    if hasattr(value, '__iter__'):
+        return [str(item) for item in value if item is not None]
+    return None if pd.isna(value) else [str(value)]
+
+def write_artifact(df: pd.DataFrame, stage: str, run_id: str) -> str:
+    """
+    Write a stage's output to a Parquet file on the shared volume and return its path.
+    Only the path travels between Airflow tasks, instead of the whole DataFrame through XCom.
+    """
+    path = os.path.join(_run_dir(run_id), f"{stage}.parquet")
+    df = df.reset_index(drop=True)
+    for col in ARRAY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(_to_list, na_action='ignore')
+    # A retried task may write the same artifact while its previous attempt is still running
+    with atomic_write(path) as f:
+        df.to_parquet(f, engine='pyarrow', index=False)
+    logger.info(f"Wrote {len(df)} rows to {path}")
+    return path
+
+def read_artifact(path: str) -> pd.DataFrame:
+    """Read a stage's output written by write_artifact(). List columns come back as Python lists."""
+    df = pd.read_parquet(path, engine='pyarrow')
+    for col in ARRAY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(list, na_action='ignore')
+    logger.info(f"Read {len(df)} rows from {path}")
+    return df
+
+def remove_artifacts(run_id: str):
+    """Delete every artifact of a run, once it has been loaded."""
+    shutil.rmtree(_run_dir(run_id), ignore_errors=True)
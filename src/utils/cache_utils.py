@@ -0,0 +1,149 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from src.constants import LLM_CACHE_EVICT_EVERY, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_PATH, LLM_CACHE_TTL_DAYS
+
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """
+    Content-addressed on-disk cache of LLM responses, backed by SQLite.
+    Entries are keyed by a hash of model, system message and prompt, so the same text
+    sent with the same instructions is only ever paid for once.
+    Entries older than ttl_days are ignored and purged, and the cache is trimmed to max_entries
+    by evicting the least recently used rows, when it opens and every evict_every inserts.
+    A hit doesn't write to the database, its access time is kept in memory and stored
+    with the next insert, eviction or close().
+    """
+    # Seconds a writer waits for another process (e.g. a parallel Airflow task) holding the database lock
+    BUSY_TIMEOUT = 30
+    # Pending access times written on their own once this many hits accumulate without an insert
+    TOUCH_FLUSH_SIZE = 1_000
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl_days: float = LLM_CACHE_TTL_DAYS,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, evict_every: int = LLM_CACHE_EVICT_EVERY):
+        self.path = path
+        self.ttl = ttl_days * 24 * 3600
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self._inserts = 0
+        # key -> last access time of the hits not written yet
+        self._touched: dict[str, float] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=self.BUSY_TIMEOUT, check_same_thread=False)
+        # WAL lets readers go on while a response is written, and makes each commit a single append
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed_at ON llm_cache (accessed_at)")
+        self._conn.commit()
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def make_key(prompt: str, system_message: str, model: str) -> str:
+        payload = json.dumps([model, system_message, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, prompt: str, system_message: str, model: str) -> str | None:
+        """Return the cached response, or None on a miss or an expired entry."""
+        key = self.make_key(prompt, system_message, model)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_FLUSH_SIZE:
+                self._write_touched()
+                self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, prompt: str, system_message: str, model: str, response: str):
+        """Store a response, every evict_every inserts also evict expired or least recently used entries."""
+        key = self.make_key(prompt, system_message, model)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self._touched.pop(key, None)
+            self._inserts += 1
+            if self._inserts % self.evict_every == 0:
+                self._evict()
+            else:
+                self._write_touched()
+                self._conn.commit()
+
+    def _write_touched(self):
+        """Store the access times of the hits since the last write, the caller commits."""
+        if self._touched:
+            self._conn.executemany("UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                                   [(accessed_at, key) for key, accessed_at in self._touched.items()])
+            self._touched.clear()
+
+    def _evict(self):
+        """Purge expired entries and trim the cache to max_entries, least recently used first."""
+        self._write_touched()
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        self._conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'size': size}
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._write_touched()
+            self._conn.commit()
+            self._conn.close()
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM cache, opening it on first use."""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+            # Store the access times of the last hits
+            atexit.register(_llm_cache.close)
+        return _llm_cache
@@ -0,0 +1,44 @@
+import logging
+from itertools import product
+from urllib.parse import quote
+
+from src.constants import PRACUJ_QUERY
+
+logger = logging.getLogger(__name__)
+
+def build_pracuj_queries(keywords: list[str], locations: list[str]) -> list[str]:
+    """
+    Expand keywords and locations into pracuj.pl results URLs.
+    The returned URLs still contain a {page} placeholder for pagination.
+    Example:
+        build_pracuj_queries(['data engineer'], ['warszawa'])
+        # Output: ['https://it.pracuj.pl/praca/data%20engineer;kw/warszawa;wp/ostatnich%2024h;p,{page}?sc=0']
+    """
+    return [
+        PRACUJ_QUERY.format(keyword=quote(keyword), location=quote(location), page='{page}')
+        for keyword, location in product(keywords, locations)
+    ]
+
+class CrawlFrontier:
+    """
+    Keeps track of offer URLs discovered while crawling results pages.
+    Listings are deduplicated on URL before any offer page is fetched.
+    Offers already in the database (known_urls, e.g. KnownUrls) are treated as seen.
+    """
+    def __init__(self, known_urls=None):
+        self.seen_urls = set()
+        self.listings = []
+        self.known_urls = known_urls
+
+    def add(self, listings: list[dict]) -> list[dict]:
+        """Register listings and return only the ones not seen before."""
+        new_listings = []
+        for listing in listings:
+            if listing['url'] in self.seen_urls:
+                continue
+            self.seen_urls.add(listing['url'])
+            if self.known_urls is not None and listing['url'] in self.known_urls:
+                continue
+            new_listings.append(listing)
+        self.listings.extend(new_listings)
+        return new_listings
@@ -0,0 +1,205 @@
+import hashlib
+import logging
+import os
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from src.constants import (
+    NEAR_DUPLICATE_BANDS,
+    NEAR_DUPLICATE_NUM_PERM,
+    NEAR_DUPLICATE_SHINGLE_SIZE,
+    NEAR_DUPLICATE_SNAPSHOT_PATH,
+    NEAR_DUPLICATE_THRESHOLD
+)
+from src.utils.artifact_utils import load_or_create_snapshot, load_snapshot, save_snapshot
+
+logger = logging.getLogger(__name__)
+
+OFFER_TEXT_COLUMNS = ['title', 'company', 'location', 'description']
+MAX_HASH = np.uint64((1 << 32) - 1)
+WORD_PATTERN = re.compile(r'\w+')
+# Words, and the unit separator (US) between the texts of a batch tokenized as one string
+TOKEN_PATTERN = re.compile(r'\w+|\x1f')
+
+def cluster_id_for(url: str) -> int:
+    """Stable, positive BIGINT id of the cluster an offer founds, derived from its url."""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little') >> 1
+
+def offer_texts(df: pd.DataFrame) -> pd.Series:
+    """Title, company, location and description of every offer as one string."""
+    columns = [df[col].fillna('').astype(str) for col in OFFER_TEXT_COLUMNS if col in df.columns]
+    return pd.Series([' '.join(parts) for parts in zip(*columns)], index=df.index) if columns else \
+        pd.Series('', index=df.index)
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles with NumPy, computed for a batch of texts at once:
+    every distinct word is hashed once (crc32), shingle hashes are combined from the word hashes as arrays,
+    and the num_perm multiply-shift hash functions ((a * x + b) mod 2^64) >> 32 are applied to chunks
+    of all the shingles of the batch.
+    """
+    # Shingles permuted per chunk, the (num_perm, chunk) uint64 buffer (16 MB) stays close to the CPU caches
+    CHUNK_SIZE = 1 << 14
+
+    def __init__(self, num_perm: int = NEAR_DUPLICATE_NUM_PERM, shingle_size: int = NEAR_DUPLICATE_SHINGLE_SIZE,
+                 seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Odd multipliers, as the multiply-shift scheme requires
+        self.a = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def shingle_hashes(self, texts) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Hashes of the word shingles of texts and the position of the text each one belongs to.
+        A text with fewer words than shingle_size is a single shingle.
+        """
+        texts = list(texts)
+        joined = '\x1f'.join(texts)
+        if joined.count('\x1f') >= len(texts):
+            # A separator inside a text would split it
+            joined = '\x1f'.join(t.replace('\x1f', ' ') for t in texts)
+        codes, uniques = pd.factorize(np.array(TOKEN_PATTERN.findall(joined.casefold()), dtype=object))
+        is_separator = np.isin(codes, np.flatnonzero(uniques == '\x1f'))
+        rows = np.cumsum(is_separator)[~is_separator]
+        if not len(rows):
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+        word_hashes = np.fromiter((zlib.crc32(w.encode('utf-8')) for w in uniques), dtype=np.uint64,
+                                  count=len(uniques))[codes[~is_separator]]
+        positions = np.arange(len(rows))
+        row_start = np.r_[0, np.flatnonzero(rows[1:] != rows[:-1]) + 1]
+        row_end = np.r_[row_start[1:], len(rows)]
+        starts_at, ends_at = np.repeat(row_start, row_end - row_start), np.repeat(row_end, row_end - row_start)
+        is_shingle = (positions + self.shingle_size <= ends_at) | \
+            ((positions == starts_at) & (ends_at - starts_at < self.shingle_size))
+        padded = np.r_[word_hashes, np.zeros(self.shingle_size, dtype=np.uint64)]
+        hashes = np.zeros(len(rows), dtype=np.uint64)
+        for offset in range(self.shingle_size):
+            # +1 so that a word hashing to 0 differs from the missing words of a short text
+            word = np.where(positions + offset < ends_at, padded[positions + offset] + np.uint64(1), np.uint64(0))
+            hashes = hashes * np.uint64(0x100000001B3) ^ word  # uint64 products wrap around
+        hashes = (hashes ^ (hashes >> np.uint64(32))) & MAX_HASH
+        return hashes[is_shingle], rows[is_shingle]
+
+    def signatures(self, texts) -> np.ndarray:
+        """(len(texts), num_perm) MinHash signatures, all MAX_HASH for a text without words."""
+        texts = list(texts)
+        # Transposed, so the minimum over the shingles of a text runs along contiguous memory
+        result = np.full((self.num_perm, len(texts)), MAX_HASH, dtype=np.uint64)
+        hashes, rows = self.shingle_hashes(texts)
+        buffer = np.empty((self.num_perm, min(self.CHUNK_SIZE, len(hashes))), dtype=np.uint64)
+        for lo in range(0, len(hashes), self.CHUNK_SIZE):
+            chunk_rows = rows[lo:lo + self.CHUNK_SIZE]
+            permuted = buffer[:, :len(chunk_rows)]
+            # uint64 products wrap around, which is the mod 2^64 of the scheme
+            np.multiply.outer(self.a, hashes[lo:lo + self.CHUNK_SIZE], out=permuted)
+            permuted += self.b[:, None]
+            permuted >>= np.uint64(32)
+            # Shingles are grouped by text: minimum over each run, then merge with the run a previous chunk ended on
+            runs = np.r_[0, np.flatnonzero(chunk_rows[1:] != chunk_rows[:-1]) + 1]
+            texts_of_runs = chunk_rows[runs]
+            result[:, texts_of_runs] = np.minimum(result[:, texts_of_runs],
+                                                  np.minimum.reduceat(permuted, runs, axis=1))
+        return result.T.astype(np.uint32)
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.signatures([text])[0]
+
+class NearDuplicateIndex:
+    """
+    LSH index of offer MinHash signatures, grouping near-duplicate offers into clusters.
+    The signature is split into bands, each band is a bucket key, so a lookup touches a constant number
+    of buckets instead of every known offer. Candidates from the buckets are confirmed with the estimated
+    Jaccard similarity against the cluster's representative signature.
+    """
+    # Bumped when the snapshot layout or the signatures change, older snapshots are rebuilt
+    VERSION = 3
+
+    def __init__(self, hasher: MinHasher | None = None, bands: int = NEAR_DUPLICATE_BANDS,
+                 threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError(f"num_perm ({self.hasher.num_perm}) must be divisible by bands ({bands})")
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self.threshold = threshold
+        self.version = self.VERSION
+        self.buckets: dict[int, set[int]] = {}
+        self.signatures: dict[int, np.ndarray] = {}
+        self.last_job_id = 0
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """(n, bands) bucket keys of (n, num_perm) signatures: every band and its rows hashed into one integer."""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        keys = np.broadcast_to(np.arange(1, self.bands + 1, dtype=np.uint64), bands.shape[:2]).copy()
+        for row in range(self.rows):
+            keys = keys * np.uint64(0x100000001B3) ^ bands[:, :, row]  # uint64 products wrap around
+        return keys
+
+    def query(self, signature: np.ndarray, keys: np.ndarray | None = None) -> int | None:
+        """
+        Cluster id of the most similar known offer above the threshold, None if there is none.
+        keys are the band_keys() of the signature, computed if not given.
+        """
+        keys = self.band_keys(signature[None])[0] if keys is None else keys
+        best, best_similarity = None, self.threshold
+        candidates = set()
+        for key in keys.tolist():
+            candidates.update(self.buckets.get(key, ()))
+        for cluster in candidates:
+            similarity = np.count_nonzero(self.signatures[cluster] == signature) / len(signature)
+            if similarity >= best_similarity:
+                best, best_similarity = cluster, similarity
+        return best
+
+    def insert(self, cluster: int, signature: np.ndarray, keys: np.ndarray | None = None):
+        """
+        Register a signature under a cluster, the first one of a cluster is its representative.
+        A bucket holds every cluster whose band lands on it, so a shared band with a dissimilar cluster
+        doesn't hide a real near-duplicate from query().
+        """
+        keys = self.band_keys(signature[None])[0] if keys is None else keys
+        self.signatures.setdefault(cluster, signature)
+        for key in keys.tolist():
+            self.buckets.setdefault(key, set()).add(cluster)
+
+    def save(self, path: str = NEAR_DUPLICATE_SNAPSHOT_PATH):
+        save_snapshot(self, path)
+
+    @classmethod
+    def load(cls, path: str = NEAR_DUPLICATE_SNAPSHOT_PATH) -> 'NearDuplicateIndex':
+        return load_snapshot(cls, path)
+
+    @classmethod
+    def from_engine(cls, engine, snapshot_path: str = NEAR_DUPLICATE_SNAPSHOT_PATH) -> 'NearDuplicateIndex':
+        """
+        Load the snapshot and add the offers loaded since it was taken, or build it from the whole table.
+        The refreshed snapshot is written back to snapshot_path.
+        """
+        index = load_or_create_snapshot(cls, snapshot_path)
+        df = pd.read_sql(
+            # As text, pandas would read a BIGINT column with NULLs as floats and round the ids
+            text(f"SELECT job_id, url, cluster_id::text AS cluster_id, {', '.join(OFFER_TEXT_COLUMNS)} FROM jobs "
+                 "WHERE job_id > :last_job_id ORDER BY job_id"),
+            engine, params={'last_job_id': index.last_job_id}
+        )
+        signatures = index.hasher.signatures(offer_texts(df))
+        keys = index.band_keys(signatures)
+        for position, (url, cluster) in enumerate(zip(df['url'], df['cluster_id'])):
+            # Rows loaded before clustering existed found their own cluster
+            cluster = int(cluster) if not pd.isna(cluster) else cluster_id_for(url)
+            index.insert(cluster, signatures[position], keys[position])
+        if not df.empty:
+            index.last_job_id = int(df['job_id'].max())
+        logger.info(f"Near duplicates: added {len(df)} offers to the snapshot ({len(index)} clusters)")
+        if not df.empty or not os.path.exists(snapshot_path):
+            index.save(snapshot_path)
+        return index
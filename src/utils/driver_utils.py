@@ -0,0 +1,90 @@
+import atexit
+import logging
+import shutil
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+CHROME_ARGUMENTS = [
+    "--headless",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--no-first-run",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--incognito",
+]
+
+class ChromeSession:
+    """
+    Headless Chrome driver bound to a temporary profile.
+    Nothing is started until start() is called, and close() quits the browser and removes the profile.
+    Can be used as a context manager:
+        with ChromeSession() as driver:
+            driver.get(url)
+    """
+    def __init__(self):
+        self.driver = None
+        self.profile_dir = None
+
+    def start(self):
+        """Start the browser if it isn't running yet and return the driver."""
+        if self.driver is None:
+            # Selenium is imported here so that importing the ETL modules (e.g. by the DAG parser) stays cheap
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+
+            options = Options()
+            for arg in CHROME_ARGUMENTS:
+                options.add_argument(arg)
+            self.profile_dir = tempfile.mkdtemp(prefix="chrome-profile-")
+            options.add_argument(f"--user-data-dir={self.profile_dir}")
+            try:
+                self.driver = webdriver.Chrome(options=options)
+            except Exception:
+                self.close()
+                raise
+            logger.info(f"Started Chrome session with profile {self.profile_dir}")
+        return self.driver
+
+    def close(self):
+        """Quit the browser and remove the temporary profile."""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Failed to quit Chrome session cleanly, {e}")
+            self.driver = None
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+def get_driver():
+    """
+    Return the process-wide Chrome driver, starting it on first use.
+    The same browser is reused by subsequent calls and closed when the interpreter exits.
+    """
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = ChromeSession()
+            atexit.register(close_driver)
+        return _shared_session.start()
+
+def close_driver():
+    """Close the process-wide Chrome driver, if it was ever started."""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
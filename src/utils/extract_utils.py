@@ -1,46 +1,132 @@
 import logging
 import re
+import unicodedata
 from typing import Union
 
-from bs4 import ResultSet
+import soupsieve
+from bs4 import BeautifulSoup, FeatureNotFound, ResultSet, Tag
 
-from src.constants import EMPLOYMENTS, JOBLEVELS, MODES, SCHEDULES, TimePeriod
-from src.etl.transform import standardize_compensation
+from src.constants import EMPLOYMENTS, HTML_PARSER, JOBLEVELS, MODES, SCHEDULES
 
 logger = logging.getLogger(__name__)
 
-def extract_job_level(raw_level_text):
+class ExtractionSpec:
+    """
+    A set of named CSS selectors compiled once with soupsieve and applied with one select_one() per field.
+    It keeps the offer page fields in one place and costs about as much as calling soup.select_one() per field,
+    the faster parsing of offer pages comes from the lxml parser (HTML_PARSER, see make_soup()).
+    Results are plain bs4 Tags, so the extract_* helpers below work with them unchanged.
     """
+    def __init__(self, selectors: dict[str, str]):
+        self.selectors = selectors
+        self.compiled = {field: soupsieve.compile(selector) for field, selector in selectors.items()}
+
+    def apply(self, soup) -> dict[str, Tag | None]:
+        """Return the first element matching each field's selector (None if absent), in document order."""
+        return {field: pattern.select_one(soup) for field, pattern in self.compiled.items()}
+
+OFFER_SPEC = ExtractionSpec({
+    'title': 'h1[data-scroll-id="job-title"]',
+    'level': 'li[data-scroll-id="position-levels"] div[data-test="offer-badge-title"]',
+    'contract': 'li[data-scroll-id="contract-types"] div[data-test="offer-badge-title"]',
+    'description': 'ul[data-test="text-about-project"]',
+    'mode': 'li[data-scroll-id="work-modes"] div[data-test="offer-badge-title"]',
+    'schedule': 'li[data-scroll-id="work-schedules"] div[data-test="offer-badge-title"]',
+    'compensation': 'div[data-test="section-salaryPerContractType"]',
+    'responsibilities': 'section[data-test="section-responsibilities"]',
+    'requirements': 'section[data-test="section-requirements"]',
+    'offered': 'section[data-test="section-offered"]',
+    'benefits': 'section[data-test="section-benefits"]',
+})
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse HTML with the configured HTML_PARSER, falling back to the built-in parser if it isn't installed."""
+    try:
+        return BeautifulSoup(html, HTML_PARSER)
+    except FeatureNotFound:
+        logger.warning(f"HTML parser '{HTML_PARSER}' is not installed, falling back to html.parser")
+        return BeautifulSoup(html, 'html.parser')
+
+# Field -> (vocabulary table, category assigned when the text matches none of it)
+# The level fallback depends on the badge having a parenthesized part, see extract_job_level()
+CATEGORY_TABLES = {
+    'level': (JOBLEVELS, None),
+    'contract': (EMPLOYMENTS, 'other'),
+    'mode': (MODES, None),
+    'schedule': (SCHEDULES, 'other'),
+}
+DASHES = str.maketrans({'‐': '-', '‑': '-', '–': '-', '—': '-'})
 
+def normalize_category_text(text) -> str:
+    """Shared normalization of the vocabulary and the scanned text: NFKC, casefold, plain dashes, single spaces."""
+    if not isinstance(text, str):
+        # Lists of badge texts are joined with a separator no keyword can span
+        text = ' | '.join(str(item) for item in text)
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().translate(DASHES).split())
+
+class CategoricalMatcher:
     """
-    level = []
-    formatted_level_text = [level.strip().lower() for text in re.findall(r'\(.*?\)', raw_level_text)
-                            for level in re.sub(r'[()]', '', text).split('/')]
-    if formatted_level_text:
-        if any(junior_kw in formatted_level_text for junior_kw in JOBLEVELS["junior"]):
-            level.append("junior")
-        if any(mid_kw in formatted_level_text for mid_kw in JOBLEVELS["mid"]):
-            level.append("mid")
-        if any(senior_kw in formatted_level_text for senior_kw in JOBLEVELS["senior"]):
-            level.append("senior")
-        if not level:
-            level.append("other")
-        return level
-    logger.debug(f"Extracted available job levels: {level}")
-    return None
+    Classifies text into the categories of the constant vocabulary tables (JOBLEVELS, MODES, ...).
+    Every keyword of every table is compiled into one regex with word boundaries, longest keywords first,
+    so a text is classified by a single scan and 'home office work' counts as remote, not as office.
+    Adding a category or a keyword only takes editing the tables.
+    """
+    def __init__(self, tables: dict[str, tuple[dict[str, list[str]], str | None]]):
+        self.fallbacks = {field: fallback for field, (_, fallback) in tables.items()}
+        self.categories = {field: list(table) for field, (table, _) in tables.items()}
+        self.keywords = {}
+        for field, (table, _) in tables.items():
+            for category, keywords in table.items():
+                for keyword in keywords:
+                    self.keywords.setdefault(normalize_category_text(keyword), []).append((field, category))
+        alternatives = '|'.join(re.escape(kw) for kw in sorted(self.keywords, key=len, reverse=True))
+        self.pattern = re.compile(r'(?<!\w)(?:' + alternatives + r')(?!\w)')
+
+    def match(self, text) -> dict[str, set[str]]:
+        """Scan the text once and return {field: matched categories} for every field with a hit."""
+        found = {}
+        for match in self.pattern.finditer(normalize_category_text(text)):
+            for field, category in self.keywords[match.group()]:
+                found.setdefault(field, set()).add(category)
+        return found
+
+    def classify(self, field: str, text) -> list[str] | None:
+        """
+        Categories of one field, in table order. The field's fallback category is used when nothing matches.
+        Returns None for empty text.
+        """
+        if not text:
+            return None
+        found = self.match(text).get(field, set())
+        categories = [category for category in self.categories[field] if category in found]
+        if not categories and self.fallbacks[field]:
+            categories.append(self.fallbacks[field])
+        logger.debug(f"Extracted available {field} categories: {categories}")
+        return categories
+
+    def classify_all(self, texts: dict[str, str | list]) -> dict[str, list[str] | None]:
+        """Classify several fields of one offer, e.g. the badge texts of a page."""
+        return {field: self.classify(field, text) for field, text in texts.items()}
+
+CATEGORY_MATCHER = CategoricalMatcher(CATEGORY_TABLES)
+
+LEVEL_PARENTHESES = re.compile(r'\(.*?\)')
+
+def extract_job_level(raw_level_text):
+    """
+    Job levels of a position badge, e.g. 'specjalista (mid / regular)' -> ['mid'].
+    Only the parenthesized parts are classified: a badge without one gives None,
+    one whose parenthesized parts match no level gives ['other'].
+    """
+    if not isinstance(raw_level_text, str):
+        return None
+    parts = LEVEL_PARENTHESES.findall(raw_level_text)
+    if not parts:
+        return None
+    return CATEGORY_MATCHER.classify('level', ' | '.join(parts)) or ['other']
 
 def extract_contract_type(raw_contract_text):
-    contract = []
-    if raw_contract_text:
-        if any(perma_kw in raw_contract_text for perma_kw in EMPLOYMENTS["permanent"]):
-            contract.append("permanent")
-        if any(b2b_kw in raw_contract_text for b2b_kw in EMPLOYMENTS["b2b"]):
-            contract.append("b2b")
-        if not contract:
-            contract.append("other")
-        return contract
-    logger.debug(f"Extracted available contract types: {contract}")
-    return None
+    return CATEGORY_MATCHER.classify('contract', raw_contract_text)
 
 def extract_desc(raw_desc):
     """
@@ -53,40 +139,20 @@ def extract_desc(raw_desc):
     return '\n'.join(desc)
 
 def extract_mode(raw_mode_text):
-    mode = []
-    if raw_mode_text:
-        if any(remote_kw in raw_mode_text for remote_kw in MODES["remote"]):
-            mode.append("remote")
-        if any(office_kw in raw_mode_text for office_kw in MODES["office"]):
-            mode.append("office")
-        if any(hybrid_kw in raw_mode_text for hybrid_kw in MODES["hybrid"]):
-            mode.append("hybrid")
-        if any(mobile_kw in raw_mode_text for mobile_kw in MODES["mobile"]):
-            mode.append("mobile")
-        return mode
-    logger.debug(f"Extracted available work modes: {mode}")
-    return None
+    """Work modes of a text or a list of badge texts."""
+    return CATEGORY_MATCHER.classify('mode', raw_mode_text)
 
 def extract_schedule(raw_schedule_text):
-    schedule = []
-    if raw_schedule_text:
-        if any(fulltime_kw in raw_schedule_text for fulltime_kw in SCHEDULES["full-time"]):
-            schedule.append("full-time")
-        if any(parttime_kw in raw_schedule_text for parttime_kw in SCHEDULES["part-time"]):
-            schedule.append("part-time")
-        if not schedule:
-            schedule.append("other")
-        return schedule
-    logger.debug(f"Extracted available schedules: {schedule}")
-    return None
+    """Work schedules of a text or a list of badge texts."""
+    return CATEGORY_MATCHER.classify('schedule', raw_schedule_text)
 
 def extract_compensation(raw_compensation_tag):
     """
         Extract compensation data.
         Most tags contain a salary range (some don't), currency, tax indication and period.
+        Returns the compensation dict as published, see transform.salary_fields().
     """
     min_str = max_str = currency = taxperiod = None
-    salary_range = []
     earning_amount_div = raw_compensation_tag.find('div', {'data-test': 'text-earningAmount'})
     if earning_amount_div:
         range_parts = re.split(r'[–-]', earning_amount_div.get_text(strip=True))
@@ -99,17 +165,14 @@ def extract_compensation(raw_compensation_tag):
         currency = earning_amount_div.find('div').get_text(strip=True)
         taxperiod = earning_amount_div.find_next_sibling('div').text.split('/')
     compensation = {
-        # Might use that information for later maybe
         'min': float(min_str) if min_str else None, 
         'max': float(max_str) if max_str else None,
         'currency': currency if currency else None,
         'tax': taxperiod[0] if taxperiod else None,
         'period': taxperiod[1] if taxperiod else None
     }
-    if compensation['min']:
-        salary_range = standardize_compensation(compensation, TimePeriod.MONTHLY)
     logger.debug(f"Extracted compensation: {compensation}")
-    return salary_range
+    return compensation
 
 def extract_fmt_list_items(raw_text_list):
     """Extract preformatted list items. Gets text and strips whitespace from a list of HTML elements."""
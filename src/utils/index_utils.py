@@ -0,0 +1,195 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from src.constants import JOB_INDEX_SNAPSHOT_PATH, RECOMMEND_TOP_K, RECOMMEND_WEIGHTS
+from src.models.models import CandidateProfile
+from src.utils.artifact_utils import load_or_create_snapshot, load_snapshot, save_snapshot
+
+logger = logging.getLogger(__name__)
+
+INDEX_COLUMNS = ['job_id', 'cluster_id', 'title', 'company', 'url', 'requirements', 'benefits', 'level', 'mode', 'contract',
+                 'sal_min', 'sal_max', 'score']
+# Offers loaded before clustering are their own cluster, negative ids can't collide with real ones.
+# No NULLs also keeps the BIGINT ids exact, pandas would read a column with NULLs as floats.
+INDEX_SELECT = {'cluster_id': 'COALESCE(cluster_id, -job_id) AS cluster_id'}
+# Job column -> prefix of its keys in the inverted index
+INDEXED_FIELDS = {'requirements': 'skill', 'level': 'level', 'mode': 'mode'}
+
+def index_key(prefix: str, keyword: str) -> str:
+    return f"{prefix}:{keyword.strip().casefold()}"
+
+def _cell_keywords(cell) -> list[str]:
+    """Keywords of a list cell, splitting the comma-separated strings standardize_features() produces."""
+    if cell is None or (not isinstance(cell, (list, tuple, np.ndarray, str)) and pd.isna(cell)):
+        return []
+    items = [cell] if isinstance(cell, str) else cell
+    return [token.strip() for item in items if item is not None for token in str(item).split(',') if token.strip()]
+
+class JobIndex:
+    """
+    In-memory inverted index of the jobs table for recommendations.
+    Keys ('skill:python', 'level:mid', 'mode:remote') map to arrays of job positions, per-job values
+    (job id, salary, the stored jobs.score, title/company/url) are kept in position order.
+    A query only visits the postings of the profile's keywords and picks the best offers with np.argpartition,
+    without sorting the candidates. New rows are appended with add(), the index is pickled to a snapshot file.
+    Near-duplicate offers (same cluster_id) are recommended once.
+    """
+    # Bumped when the snapshot layout or the source of its values changes, older snapshots are rebuilt
+    VERSION = 4
+
+    def __init__(self):
+        self.version = self.VERSION
+        self.postings: dict[str, np.ndarray] = {}
+        self.job_ids = np.empty(0, dtype=np.int64)
+        self.cluster_ids = np.empty(0, dtype=np.int64)
+        self.sal_max = np.empty(0)
+        self.base_scores = np.empty(0)
+        self.jobs: list[tuple] = []
+        # Highest jobs.score_seq applied, rows scored by a later score_jobs() run are re-read on refresh
+        self.last_score_seq = 0
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    @property
+    def last_job_id(self) -> int:
+        return int(self.job_ids.max()) if len(self.job_ids) else 0
+
+    def add(self, df: pd.DataFrame):
+        """Append jobs (rows with the INDEX_COLUMNS) to the index. Rows not scored yet rank with a score of 0."""
+        if df.empty:
+            return
+        df = df.reset_index(drop=True)
+        start = len(self.jobs)
+        new_postings: dict[str, list[int]] = {}
+        for column, prefix in INDEXED_FIELDS.items():
+            for offset, cell in enumerate(df[column]):
+                for keyword in _cell_keywords(cell):
+                    new_postings.setdefault(index_key(prefix, keyword), []).append(start + offset)
+        for key, positions in new_postings.items():
+            # A job may list a keyword twice
+            positions = np.unique(np.array(positions, dtype=np.int64))
+            self.postings[key] = np.concatenate([self.postings[key], positions]) if key in self.postings else positions
+
+        sal_min = pd.to_numeric(df['sal_min'], errors='coerce').to_numpy(dtype=float)
+        sal_max = pd.to_numeric(df['sal_max'], errors='coerce').to_numpy(dtype=float)
+        self.sal_max = np.concatenate([self.sal_max, np.where(np.isnan(sal_max), sal_min, sal_max)])
+        scores = pd.to_numeric(df['score'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+        self.base_scores = np.concatenate([self.base_scores, scores])
+        job_ids = df['job_id'].to_numpy(dtype=np.int64)
+        self.job_ids = np.concatenate([self.job_ids, job_ids])
+        self.cluster_ids = np.concatenate([self.cluster_ids, df['cluster_id'].to_numpy(dtype=np.int64)])
+        self.jobs.extend(zip(df['title'], df['company'], df['url']))
+
+    def search(self, profile: CandidateProfile, k: int = RECOMMEND_TOP_K,
+               weights: dict[str, float] = RECOMMEND_WEIGHTS) -> list[dict]:
+        """
+        Top k offers for the profile, best first.
+        Offers must match at least one skill when the profile lists any. Offers paying less than
+        min_salary are dropped, offers without a salary are kept.
+        """
+        if not self.jobs:
+            return []
+        scores = weights.get('score', 0.0) * self.base_scores
+        skill_hits = np.zeros(len(self.jobs), dtype=bool)
+        for skill in profile.skills:
+            positions = self.postings.get(index_key('skill', skill))
+            if positions is not None:
+                scores[positions] += weights.get('skill', 1.0)
+                skill_hits[positions] = True
+        if profile.level:
+            positions = self.postings.get(index_key('level', profile.level))
+            if positions is not None:
+                scores[positions] += weights.get('level', 0.0)
+        for mode in profile.mode:
+            positions = self.postings.get(index_key('mode', mode))
+            if positions is not None:
+                scores[positions] += weights.get('mode', 0.0)
+
+        candidates = np.flatnonzero(skill_hits) if profile.skills else np.arange(len(self.jobs))
+        if profile.min_salary:
+            # NaN salaries compare False and stay
+            candidates = candidates[~(self.sal_max[candidates] < profile.min_salary)]
+        # Sort only the best `wanted` candidates, more of them when near-duplicates leave fewer than k clusters
+        candidate_scores = scores[candidates]
+        wanted = k
+        while True:
+            if wanted < len(candidates):
+                best = np.argpartition(-candidate_scores, wanted - 1)[:wanted]
+            else:
+                best = np.arange(len(candidates))
+            # Best score first, ties by position
+            best = best[np.lexsort((candidates[best], -candidate_scores[best]))]
+            top, seen_clusters = [], set()
+            for score, position in zip(candidate_scores[best].tolist(), candidates[best].tolist()):
+                if self.cluster_ids[position] not in seen_clusters:
+                    seen_clusters.add(self.cluster_ids[position])
+                    top.append((score, position))
+                    if len(top) == k:
+                        break
+            if len(top) == k or len(best) == len(candidates):
+                break
+            wanted *= 2
+        return [
+            dict(zip(('title', 'company', 'url'), self.jobs[position]),
+                 job_id=int(self.job_ids[position]), match=round(score, 4))
+            for score, position in top
+        ]
+
+    def refresh(self, engine) -> int:
+        """
+        Add the rows loaded since the last refresh and re-read the scores of the rows score_jobs() rescored.
+        load_to_db() takes job ids from the jobs_job_id_seq sequence, so new rows have higher ids,
+        and every score_jobs() run stamps its rows with a higher jobs.score_seq.
+        Returns:
+            int: Number of added and rescored rows.
+        """
+        with engine.connect() as conn:
+            score_seq = conn.execute(text("SELECT COALESCE(MAX(score_seq), 0) FROM jobs")).scalar()
+        rescored = 0
+        if len(self) and score_seq > self.last_score_seq:
+            scores = pd.read_sql(
+                text("SELECT job_id, score FROM jobs WHERE score_seq > :last_score_seq AND job_id <= :last_job_id"),
+                engine, params={'last_score_seq': self.last_score_seq, 'last_job_id': self.last_job_id}
+            )
+            # Rows are added in job id order, so job_ids is sorted
+            ids = scores['job_id'].to_numpy(dtype=np.int64)
+            positions = np.searchsorted(self.job_ids, ids)
+            found = positions < len(self.job_ids)
+            found[found] = self.job_ids[positions[found]] == ids[found]
+            values = pd.to_numeric(scores['score'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+            self.base_scores[positions[found]] = values[found]
+            rescored = int(found.sum())
+
+        df = pd.read_sql(
+            text(f"SELECT {', '.join(INDEX_SELECT.get(col, col) for col in INDEX_COLUMNS)} "
+                 "FROM jobs WHERE job_id > :last_job_id ORDER BY job_id"),
+            engine, params={'last_job_id': self.last_job_id}
+        )
+        self.add(df)
+        self.last_score_seq = score_seq
+        return len(df) + rescored
+
+    def save(self, path: str = JOB_INDEX_SNAPSHOT_PATH):
+        save_snapshot(self, path)
+
+    @classmethod
+    def load(cls, path: str = JOB_INDEX_SNAPSHOT_PATH) -> 'JobIndex':
+        return load_snapshot(cls, path)
+
+    @classmethod
+    def from_engine(cls, engine, snapshot_path: str = JOB_INDEX_SNAPSHOT_PATH) -> 'JobIndex':
+        """
+        Load the snapshot and add the jobs loaded since it was taken, or build the index with one scan.
+        The refreshed snapshot is written back to snapshot_path.
+        """
+        index = load_or_create_snapshot(cls, snapshot_path)
+        changed = index.refresh(engine)
+        logger.info(f"Job index: added or rescored {changed} jobs ({len(index)} indexed)")
+        if changed or not os.path.exists(snapshot_path):
+            index.save(snapshot_path)
+        return index
@@ -0,0 +1,157 @@
+import json
+import logging
+import re
+
+from src.etl.transform import salary_fields
+from src.models.models import Job
+from src.utils.extract_utils import extract_contract_type, extract_job_level, extract_mode, extract_schedule
+
+logger = logging.getLogger(__name__)
+
+NEXT_DATA_PATTERN = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+)
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL
+)
+# schema.org unitText -> period understood by standardize_compensation()
+JSON_LD_PERIODS = {'HOUR': 'hr', 'MONTH': 'mth', 'YEAR': 'yr'}
+TEXT_KEYS = ('textElements', 'bullets', 'paragraphs', 'items')
+
+def extract_next_data(html: str) -> dict | None:
+    """Return the Next.js __NEXT_DATA__ payload of a page, without building a DOM."""
+    match = NEXT_DATA_PATTERN.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError as e:
+        logger.warning(f"Failed to decode __NEXT_DATA__, {e}")
+        return None
+
+def extract_json_ld(html: str) -> list[dict]:
+    """Return every JSON-LD object of a page, flattening @graph containers and top-level lists."""
+    objects = []
+    for match in JSON_LD_PATTERN.finditer(html):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if isinstance(item, dict):
+                objects.extend(item.get('@graph', [item]))
+    return objects
+
+def _find_offer(node):
+    """Depth-first search for the offer object (the dict carrying jobTitle) in the Next.js state."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if 'jobTitle' in current and ('textSections' in current or 'attributes' in current):
+                return current
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return None
+
+def _collect_text(node) -> list[str]:
+    """Collect the text items of a section, whatever nesting (textElements, bullets, subSections...) it uses."""
+    texts = []
+    if isinstance(node, str):
+        if node.strip():
+            texts.append(node.strip())
+    elif isinstance(node, list):
+        for item in node:
+            texts.extend(_collect_text(item))
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            if key in TEXT_KEYS or key in ('subSections', 'model'):
+                texts.extend(_collect_text(value))
+    return texts
+
+def _sections(offer: dict) -> dict[str, list[str]]:
+    sections = {}
+    for section in offer.get('textSections') or offer.get('sections') or []:
+        section_type = str(section.get('sectionType', '')).lower()
+        sections.setdefault(section_type, []).extend(_collect_text(section))
+    return sections
+
+def _names(items) -> list[str]:
+    return [str(item.get('name')).strip() for item in items or [] if isinstance(item, dict) and item.get('name')]
+
+def _salary_from_contracts(contracts: list) -> dict | None:
+    """Compensation of the first contract type that publishes a salary."""
+    for contract in contracts or []:
+        salary = contract.get('salary') if isinstance(contract, dict) else None
+        if not salary or not salary.get('from'):
+            continue
+        time_unit = salary.get('timeUnit') or {}
+        return {
+            'min': float(salary['from']),
+            'max': float(salary.get('to') or salary['from']),
+            'currency': (salary.get('currency') or {}).get('code'),
+            'tax': (salary.get('kind') or {}).get('name'),
+            'period': time_unit.get('shortForm') or time_unit.get('longForm') or 'mies'
+        }
+    return None
+
+def _salary_from_json_ld(posting: dict) -> dict | None:
+    salary = posting.get('baseSalary') or {}
+    value = salary.get('value') or {}
+    minimum = value.get('minValue') or value.get('value')
+    if not minimum:
+        return None
+    return {
+        'min': float(minimum),
+        'max': float(value.get('maxValue') or minimum),
+        'currency': salary.get('currency'),
+        'tax': None,
+        'period': JSON_LD_PERIODS.get(str(value.get('unitText', '')).upper(), 'mth')
+    }
+
+def job_from_json_state(listing: dict, html: str) -> Job | None:
+    """
+    Build a Job from the structured data pracuj.pl embeds in an offer page.
+    The Next.js state is preferred as it holds every field, JSON-LD (schema.org JobPosting) fills what it lacks.
+    Returns None when the page has no usable payload, so the caller can fall back to rendering the page.
+    """
+    offer = _find_offer(extract_next_data(html) or {})
+    posting = next((obj for obj in extract_json_ld(html) if obj.get('@type') == 'JobPosting'), {})
+    if offer is None and not posting:
+        return None
+
+    title = (offer or {}).get('jobTitle') or posting.get('title')
+    if title and listing.get('title') and title.strip() != listing['title']:
+        logger.error(f"Failed to retrieve more job details from {listing['url']}")
+        return None
+
+    employment = ((offer or {}).get('attributes') or {}).get('employment') or {}
+    levels = _names(employment.get('positionLevels'))
+    contracts = employment.get('typesOfContracts') or []
+    contract_names = _names(contracts)
+    modes = _names(employment.get('workModes'))
+    schedules = _names(employment.get('workSchedules'))
+    sections = _sections(offer or {})
+
+    compensation = _salary_from_contracts(contracts)
+    if compensation is None and posting:
+        compensation = _salary_from_json_ld(posting)
+
+    return Job(
+        title = listing.get('title') or title,
+        company = listing.get('company') or ((offer or {}).get('employer') or {}).get('name')
+                  or (posting.get('hiringOrganization') or {}).get('name'),
+        location = listing.get('location'),
+        description = '\n'.join(sections.get('about-project', [])) or posting.get('description'),
+        mode = extract_mode(modes),
+        contract = extract_contract_type(contract_names),
+        # Badge form 'name (level / level)', so the levels get the same parsing as on the page
+        level = extract_job_level(f"({' / '.join(levels)})") if levels else None,
+        schedule = extract_schedule(schedules),
+        responsibilities = sections.get('responsibilities'),
+        requirements = [item for key, items in sections.items() if key.startswith('requirements') for item in items],
+        benefits = sections.get('offered') or sections.get('benefits'),
+        url = listing['url'],
+        **salary_fields(compensation)
+    )
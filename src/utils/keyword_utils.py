@@ -0,0 +1,185 @@
+import logging
+import re
+from collections import deque
+from functools import lru_cache
+
+from src.constants import KEYWORD_CONTEXT_ALIASES, KEYWORD_EXCLUDED_ALIASES, KEYWORD_SYNONYMS, SYSTEM_MESSAGE
+
+logger = logging.getLogger(__name__)
+
+# A number of years, the lower bound of a range ('3-5 years', '3 do 5 lat') is captured
+YEARS = r'(\d{1,2})\s*(?:\+|(?:-|–|to|do)\s*\d{1,2})?\s*\+?\s*(?:years?|yrs?|lat[a]?|roku)\b'
+EXPERIENCE = r'(?:experience|doświadczeni)'
+# Words between the years and the experience phrase, within a sentence ('min. 3 lata' doesn't end one)
+YOE_GAP = r'(?:[^.;!?\n]|\.(?!\s+[A-ZĄĆĘŁŃÓŚŹŻ])){0,40}?'
+# Years only count next to experience phrasing: '6+ years of ETL experience', 'Doświadczenie: min. 3 lata'
+YOE_PATTERN = re.compile(
+    YEARS + YOE_GAP + r'\b' + EXPERIENCE + r'|\b' + EXPERIENCE + r'\w*' + YOE_GAP + YEARS,
+    re.IGNORECASE
+)
+# Text between two keywords of a list: 'react, typescript', 'spark/flink', 'rust or c++'
+LIST_SEPARATOR = re.compile(r'[\s,/;|&+()]*(?:\b(?:and|or|i|oraz|lub)\b)?[\s,/;|&+()]*')
+# Characters a context alias with a capital letter may be within from another keyword
+CONTEXT_WINDOW = 40
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over lowercase aliases.
+    Finds every occurrence of every alias in a single pass over the text.
+    """
+    def __init__(self, aliases: dict[str, str]):
+        """aliases maps a lowercase alias to the canonical keyword it stands for."""
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for alias, keyword in aliases.items():
+            node = 0
+            for char in alias:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append((len(alias), keyword))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str):
+        """Yield (start, end, keyword) for every alias occurrence bounded by non-alphanumeric characters."""
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for length, keyword in self.output[node]:
+                start = i - length + 1
+                if (start == 0 or not text[start - 1].isalnum()) and \
+                   (i + 1 == len(text) or not text[i + 1].isalnum()):
+                    yield start, i + 1, keyword
+
+class KeywordMatcher:
+    """
+    Deterministic keyword extractor over the closed vocabulary of SYSTEM_MESSAGE.
+    Maps responsibilities/requirements to Technical Keywords and benefits to Benefits Keywords,
+    plus the YOE rule, without calling the LLM.
+    """
+    def __init__(self, technical: list[str], benefits: list[str], synonyms: dict[str, list[str]],
+                 excluded_aliases: set[str], context_aliases: set[str] = frozenset()):
+        self.context_aliases = context_aliases
+        self.automata = {
+            'technical': AhoCorasick(_build_aliases(technical, synonyms, excluded_aliases)),
+            'benefits': AhoCorasick(_build_aliases(benefits, synonyms, excluded_aliases)),
+        }
+
+    def match(self, text: str, category: str) -> list[str]:
+        """
+        Return canonical keywords found in text, deduplicated, in order of appearance.
+        Example:
+            get_keyword_matcher().match("We value diversity, equity and inclusion", 'benefits')
+            # Output: ['Inclusive Culture'], 'equity' alone isn't Stock Options
+            get_keyword_matcher().match("React to incidents in our Python services", 'requirements')
+            # Output: ['Python'], 'React' needs a tech context, see in_context()
+        """
+        vocabulary = 'benefits' if category == 'benefits' else 'technical'
+        collapsed = ' '.join(str(text).split())
+        normalized = collapsed.lower()
+        found = list(self.automata[vocabulary].find(normalized))
+        keywords = list(dict.fromkeys(
+            keyword for start, end, keyword in found
+            if normalized[start:end] not in self.context_aliases or in_context(start, end, found, normalized, collapsed)
+        ))
+        if vocabulary == 'technical':
+            # The strongest requirement wins, a range counts with its lower bound
+            years = [int(before or after) for before, after in YOE_PATTERN.findall(collapsed)]
+            if years:
+                keywords.append("5+ YOE" if max(years) >= 5 else "0-4 YOE")
+        return keywords
+
+    def summarize(self, items: list[str], category: str) -> tuple[list[str], float]:
+        """
+        Map a list of items to keywords.
+        Returns:
+            tuple: (keywords, confidence), where confidence is the share of items that matched any keyword.
+        """
+        keywords = []
+        matched_items = 0
+        for item in items:
+            item_keywords = self.match(item, category)
+            if item_keywords:
+                matched_items += 1
+                keywords.extend(item_keywords)
+        confidence = matched_items / len(items) if items else 0.0
+        return list(dict.fromkeys(keywords)), confidence
+
+def normalize_text(text: str) -> str:
+    return ' '.join(str(text).lower().split())
+
+def in_context(start: int, end: int, found: list[tuple], normalized: str, collapsed: str) -> bool:
+    """
+    Whether the alias at normalized[start:end] is used as a technology, judged from the other matches (found):
+    the alias is the whole item ('React'), or listed next to another keyword ('React, TypeScript'),
+    or capitalised mid-sentence with another keyword nearby ('UIs in React with TypeScript').
+    collapsed is the text before lowercasing, with the same whitespace as normalized.
+    """
+    if normalized.strip(' .,;:-*()') == normalized[start:end]:
+        return True
+    others = [(s, e) for s, e, _ in found if e <= start or s >= end]
+    if any(LIST_SEPARATOR.fullmatch(normalized[e:start] if e <= start else normalized[end:s]) for s, e in others):
+        return True
+    preceding = collapsed[:start].rstrip()
+    # Lowercasing may change the length of some characters, the positions then don't map to collapsed
+    capitalised = len(collapsed) == len(normalized) and collapsed[start].isupper() \
+        and bool(preceding) and (preceding[-1].isalnum() or preceding[-1] == ',')
+    return capitalised and any(s < end + CONTEXT_WINDOW and e > start - CONTEXT_WINDOW for s, e in others)
+
+def _build_aliases(vocabulary: list[str], synonyms: dict[str, list[str]], excluded_aliases: set[str]) -> dict[str, str]:
+    """
+    Derive lowercase aliases for every canonical keyword:
+    'CDC (Change Data Capture)' -> 'cdc (change data capture)', 'cdc', 'change data capture'
+    'Avro/Parquet' -> 'avro/parquet', 'avro', 'parquet'
+    """
+    aliases = {}
+    for keyword in vocabulary:
+        if keyword.startswith('('):
+            # Placeholders like (cloud platform) are resolved by their concrete entries
+            continue
+        candidates = {keyword}
+        match = re.match(r'^(.*?)\s*\((.*?)\)$', keyword)
+        if match:
+            candidates.update(match.groups())
+        if '/' in keyword:
+            candidates.update(part.strip() for part in keyword.split('/'))
+        candidates.update(synonyms.get(keyword, []))
+        for candidate in candidates:
+            alias = normalize_text(candidate)
+            if alias and alias not in excluded_aliases:
+                aliases.setdefault(alias, keyword)
+    return aliases
+
+def parse_vocabulary(system_message: str, name: str) -> list[str]:
+    """Read a keyword list, e.g. 'Technical Keywords', out of the system message."""
+    match = re.search(rf'\*\*{name}:\*\*\s*\[(.*?)\]', system_message, re.DOTALL)
+    if not match:
+        return []
+    return [keyword.strip() for keyword in match.group(1).split(',') if keyword.strip()]
+
+@lru_cache(maxsize=1)
+def get_keyword_matcher() -> KeywordMatcher:
+    """Build the matcher once per process from SYSTEM_MESSAGE and the synonym tables."""
+    return KeywordMatcher(
+        parse_vocabulary(SYSTEM_MESSAGE, 'Technical Keywords'),
+        parse_vocabulary(SYSTEM_MESSAGE, 'Benefits Keywords'),
+        KEYWORD_SYNONYMS,
+        KEYWORD_EXCLUDED_ALIASES,
+        KEYWORD_CONTEXT_ALIASES
+    )
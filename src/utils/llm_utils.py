@@ -0,0 +1,62 @@
+import logging
+import os
+import threading
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI, Timeout
+
+try:
+    # Recent openai releases ship their own httpx fork, the pool limits have to come from the same package
+    import httpx2 as httpx
+except ImportError:
+    import httpx
+
+from src.constants import LLM_BASE_URL, LLM_CONNECT_TIMEOUT, LLM_MAX_CONNECTIONS, LLM_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+
+def _timeout() -> Timeout:
+    return Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS)
+
+def get_llm_client() -> OpenAI:
+    """
+    Return the process-wide OpenAI-compatible client, creating it on first use.
+    The client keeps its HTTP connections alive, so repeated calls skip connection setup and TLS handshakes.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            load_dotenv()
+            _client = OpenAI(
+                api_key=os.getenv('GEMINI_API_KEY'),
+                base_url=LLM_BASE_URL,
+                timeout=_timeout(),
+                http_client=DefaultHttpxClient(limits=_limits(), timeout=_timeout())
+            )
+            logger.info("Created shared LLM client")
+        return _client
+
+def set_llm_client(client: OpenAI | None):
+    """Replace the shared client, e.g. with a stub in tests. None resets it to be lazily recreated."""
+    global _client
+    with _client_lock:
+        _client = client
+
+def create_async_llm_client() -> AsyncOpenAI:
+    """
+    Create an asyncio client with the same settings as the shared one.
+    Async connection pools are bound to their event loop, so each asyncio.run() needs its own client.
+    """
+    load_dotenv()
+    return AsyncOpenAI(
+        api_key=os.getenv('GEMINI_API_KEY'),
+        base_url=LLM_BASE_URL,
+        timeout=_timeout(),
+        http_client=DefaultAsyncHttpxClient(limits=_limits(), timeout=_timeout())
+    )
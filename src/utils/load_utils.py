@@ -0,0 +1,115 @@
+import hashlib
+import logging
+import math
+import os
+import struct
+
+from sqlalchemy import text
+
+from src.constants import KNOWN_URLS_FALSE_POSITIVE_RATE, KNOWN_URLS_SNAPSHOT_PATH
+from src.utils.artifact_utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Snapshot header: magic, capacity, size, hashes and the last job id added
+SNAPSHOT_MAGIC = b'BLM2'
+SNAPSHOT_HEADER = struct.Struct('<4sQQQQ')
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, serializable to a single file."""
+    def __init__(self, capacity: int, error_rate: float = KNOWN_URLS_FALSE_POSITIVE_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.capacity = capacity
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def save(self, path: str, last_job_id: int):
+        with atomic_write(path) as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, self.capacity, self.size, self.hashes, last_job_id))
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str) -> tuple['BloomFilter', int]:
+        with open(path, 'rb') as f:
+            magic, capacity, size, hashes, last_job_id = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} isn't a known URLs snapshot (version {SNAPSHOT_MAGIC.decode()})")
+            bloom = cls.__new__(cls)
+            bloom.capacity, bloom.size, bloom.hashes = capacity, size, hashes
+            bloom.bits = bytearray(f.read())
+        return bloom, last_job_id
+
+class KnownUrls:
+    """
+    Set of offer URLs already stored in the jobs table.
+    Lookups go to a Bloom filter snapshot of the table. A negative answer is exact,
+    a positive one is confirmed against the database when an engine is available,
+    so a false positive never drops a new offer.
+    """
+    def __init__(self, bloom: BloomFilter, engine=None):
+        self.bloom = bloom
+        self.engine = engine
+
+    @classmethod
+    def from_engine(cls, engine, snapshot_path: str = KNOWN_URLS_SNAPSHOT_PATH) -> 'KnownUrls':
+        """
+        Load the snapshot and add URLs loaded since it was taken, or build it from scratch with one scan.
+        Like NearDuplicateIndex, the refresh is keyed on the last job id the snapshot holds, not on added_date,
+        which is shared by a whole run and may be earlier than the moment the snapshot was taken.
+        The refreshed snapshot is written back to snapshot_path.
+        """
+        with engine.connect() as conn:
+            count = conn.execute(text("SELECT COUNT(*) FROM job_urls")).scalar() or 0
+            bloom, last_job_id = None, 0
+            if os.path.exists(snapshot_path):
+                try:
+                    bloom, last_job_id = BloomFilter.load(snapshot_path)
+                except (OSError, struct.error, ValueError) as e:
+                    logger.warning(f"Failed to read known URLs snapshot {snapshot_path}, rebuilding it. {e}")
+            if bloom is None or count > bloom.capacity:
+                # Missing snapshot, or history outgrew it: rebuild with headroom
+                bloom, last_job_id = BloomFilter(capacity=max(count * 2, 10_000)), 0
+            result = conn.execution_options(stream_results=True).execute(
+                text("SELECT url, job_id FROM job_urls WHERE job_id > :last_job_id"), {'last_job_id': last_job_id}
+            )
+            added = 0
+            for url, job_id in result:
+                bloom.add(url)
+                last_job_id = max(last_job_id, job_id)
+                added += 1
+        logger.info(f"Known URLs: added {added} URLs to the snapshot ({count} jobs in the table)")
+        bloom.save(snapshot_path, last_job_id)
+        return cls(bloom, engine)
+
+    def __contains__(self, url: str) -> bool:
+        if not url or url not in self.bloom:
+            return False
+        if self.engine is None:
+            return True
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT 1 FROM job_urls WHERE url = :url"), {'url': url}).first() is not None
+
+    def filter_new(self, urls: list[str]) -> set[str]:
+        """Return the subset of urls that aren't in the jobs table yet, confirming candidates in one query."""
+        candidates = {url for url in urls if url and url in self.bloom}
+        new_urls = {url for url in urls if url} - candidates
+        if candidates and self.engine is not None:
+            with self.engine.connect() as conn:
+                existing = {row[0] for row in conn.execute(
+                    text("SELECT url FROM job_urls WHERE url = ANY(:urls)"), {'urls': list(candidates)}
+                )}
+            new_urls |= candidates - existing
+        return new_urls
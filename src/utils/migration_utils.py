@@ -0,0 +1,95 @@
+import logging
+import os
+import sys
+
+from sqlalchemy import create_engine
+
+from src.constants import DATABASE_URL, JOBS_PARTITION_YEARS_AHEAD
+
+logger = logging.getLogger(__name__)
+
+# Numbered SQL files (NNN_description.sql), applied in order, each once
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+# pg_advisory_lock key, so concurrent task runners don't apply the same migration twice
+MIGRATIONS_LOCK_ID = 7_200_311
+
+def list_migrations(directory: str = MIGRATIONS_DIR) -> list[tuple[str, str]]:
+    """(version, path) of the migration files, sorted by version."""
+    return sorted(
+        (name[:-len('.sql')], os.path.join(directory, name))
+        for name in os.listdir(directory) if name.endswith('.sql')
+    )
+
+def apply_migrations(engine, directory: str = MIGRATIONS_DIR) -> list[str]:
+    """
+    Bring the jobs database schema up to date.
+    Applied versions are recorded in schema_migrations, every pending migration runs in its own transaction.
+    Returns:
+        list[str]: Versions applied by this call.
+    """
+    applied = []
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATIONS_LOCK_ID,))
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS schema_migrations "
+                "(version TEXT PRIMARY KEY, applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+            conn.commit()
+            cur.execute("SELECT version FROM schema_migrations")
+            done = {row[0] for row in cur.fetchall()}
+            for version, path in list_migrations(directory):
+                if version in done:
+                    continue
+                logger.info(f"Applying migration {version}")
+                with open(path) as f:
+                    sql = f.read()
+                try:
+                    cur.execute(sql)
+                    cur.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    logger.error(f"Migration {version} failed, the schema stays at the previous version")
+                    raise
+                applied.append(version)
+            cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATIONS_LOCK_ID,))
+            conn.commit()
+    finally:
+        conn.close()
+    logger.info(f"Schema is up to date, applied {len(applied)} migrations: {applied}")
+    return applied
+
+def ensure_partitions(engine, years_ahead: int = JOBS_PARTITION_YEARS_AHEAD) -> list[int]:
+    """
+    Create the yearly jobs partitions of the current year and the next years_ahead years, if missing,
+    with ensure_jobs_partition() (migration 007). Run after apply_migrations(), e.g. by migrate_task.
+    Returns:
+        list[int]: Years whose partition was created by this call.
+    """
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT y FROM generate_series(EXTRACT(YEAR FROM CURRENT_DATE)::INT, "
+                "EXTRACT(YEAR FROM CURRENT_DATE)::INT + %s) AS y WHERE ensure_jobs_partition(y)",
+                (years_ahead,)
+            )
+            created = [row[0] for row in cur.fetchall()]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    if created:
+        logger.info(f"Created jobs partitions for {created}")
+    return created
+
+if __name__ == "__main__":
+    # python -m src.utils.migration_utils [database url]
+    logging.basicConfig(level=logging.INFO)
+    engine = create_engine(sys.argv[1] if len(sys.argv) > 1 else DATABASE_URL)
+    apply_migrations(engine)
+    ensure_partitions(engine)
@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.constants import (
+    EMPLOYMENTS,
+    JOBLEVELS,
+    MODES,
+    SCORE_SALARY_SCALE,
+    SCORING_DEFAULT_WEIGHTS,
+    SCORING_MODEL_PATH,
+    SYSTEM_MESSAGE
+)
+from src.utils.keyword_utils import parse_vocabulary
+
+logger = logging.getLogger(__name__)
+
+class SparseMatrix:
+    """
+    Minimal CSR matrix: the columns of row i are indices[indptr[i]:indptr[i + 1]], with values in data.
+    Only the operations scoring needs are implemented, on plain NumPy arrays.
+    """
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: tuple[int, int]):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+
+    @classmethod
+    def from_coo(cls, rows: np.ndarray, cols: np.ndarray, values: np.ndarray, shape: tuple[int, int]) -> 'SparseMatrix':
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(values[order].astype(float), cols[order].astype(np.int64), indptr, shape)
+
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Matrix-vector product."""
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return np.bincount(rows, weights=self.data * vector[self.indices], minlength=self.shape[0])
+
+    def toarray(self) -> np.ndarray:
+        dense = np.zeros(self.shape)
+        dense[np.repeat(np.arange(self.shape[0]), np.diff(self.indptr)), self.indices] = self.data
+        return dense
+
+class FeatureEncoder:
+    """
+    Encodes standardized jobs into a sparse feature matrix over a fixed vocabulary:
+    one binary column per '<field>:<keyword>' plus a numeric 'salary' column.
+    Cells may be lists or the comma-separated keyword strings standardize_features() produces.
+    """
+    def __init__(self, vocabularies: dict[str, list[str]]):
+        self.features = []
+        self.columns = {}
+        for field, keywords in vocabularies.items():
+            lookup = {}
+            for keyword in keywords:
+                lookup.setdefault(keyword.strip().casefold(), len(self.features))
+                self.features.append(f"{field}:{keyword}")
+            self.columns[field] = lookup
+        self.salary_column = len(self.features)
+        self.features.append('salary')
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _item_columns(self, item, lookup: dict[str, int]) -> list[int]:
+        # A cell may be a single comma-separated string, or a JSON-encoded list after flatten_lists()
+        tokens = str(item).replace('[', '').replace(']', '').replace('"', '').split(',')
+        return [lookup[token] for token in (t.strip().casefold() for t in tokens) if token in lookup]
+
+    def _field_entries(self, cells: pd.Series, field: str) -> tuple[np.ndarray, np.ndarray]:
+        """(row positions, column ids) of every vocabulary keyword found in a column."""
+        items = pd.Series(cells.to_numpy(dtype=object)).explode()
+        # Jobs share most of their items, each distinct item is tokenized once
+        codes, uniques = pd.factorize(items)
+        per_unique = [self._item_columns(item, self.columns[field]) for item in uniques]
+        counts = np.array([len(columns) for columns in per_unique] + [0], dtype=np.int64)
+        unique_columns = np.fromiter((c for columns in per_unique for c in columns), dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(counts)])
+        # Missing items were coded -1, which picks the empty trailing entry
+        item_counts = counts[codes]
+        rows = np.repeat(items.index.to_numpy(dtype=np.int64), item_counts)
+        offsets = np.arange(item_counts.sum()) - np.repeat(np.cumsum(item_counts) - item_counts, item_counts)
+        return rows, unique_columns[np.repeat(starts[codes], item_counts) + offsets]
+
+    def encode(self, df: pd.DataFrame) -> SparseMatrix:
+        rows, cols = [], []
+        for field in self.columns:
+            if field in df.columns:
+                field_rows, field_cols = self._field_entries(df[field], field)
+                rows.append(field_rows)
+                cols.append(field_cols)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        # Repeated keywords in one job count once
+        keys = np.sort(rows * len(self) + cols)
+        keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])] if len(keys) else keys
+        rows, cols = keys // len(self), keys % len(self)
+        values = np.ones(len(keys))
+
+        if 'sal_min' in df.columns:
+            sal_min = pd.to_numeric(df['sal_min'], errors='coerce').to_numpy(dtype=float)
+            sal_max = pd.to_numeric(df.get('sal_max', df['sal_min']), errors='coerce').to_numpy(dtype=float)
+            salary = np.where(np.isnan(sal_max), sal_min, (sal_min + sal_max) / 2) / SCORE_SALARY_SCALE
+            has_salary = np.flatnonzero(~np.isnan(salary))
+            rows = np.concatenate([rows, has_salary])
+            cols = np.concatenate([cols, np.full(len(has_salary), self.salary_column)])
+            values = np.concatenate([values, salary[has_salary]])
+        return SparseMatrix.from_coo(rows, cols, values, (len(df), len(self)))
+
+def default_vocabularies() -> dict[str, list[str]]:
+    """The keyword lists of SYSTEM_MESSAGE and the categories of the extraction tables."""
+    return {
+        'requirements': parse_vocabulary(SYSTEM_MESSAGE, 'Technical Keywords'),
+        'benefits': parse_vocabulary(SYSTEM_MESSAGE, 'Benefits Keywords'),
+        'level': list(JOBLEVELS) + ['other'],
+        'mode': list(MODES),
+        'contract': list(EMPLOYMENTS) + ['other'],
+    }
+
+class JobScorer:
+    """
+    Linear scoring model over FeatureEncoder features: score = intercept + X @ weights.
+    Every job of a batch is scored with one sparse matrix-vector product.
+    """
+    def __init__(self, weights: dict[str, float], intercept: float = 0.0, encoder: FeatureEncoder | None = None):
+        self.encoder = encoder or FeatureEncoder(default_vocabularies())
+        self.intercept = intercept
+        index = {feature: i for i, feature in enumerate(self.encoder.features)}
+        unknown = set(weights) - set(index)
+        if unknown:
+            logger.warning(f"Ignoring weights of unknown features: {sorted(unknown)}")
+        self.weights = np.zeros(len(self.encoder))
+        for feature, weight in weights.items():
+            if feature in index:
+                self.weights[index[feature]] = weight
+
+    def score(self, df: pd.DataFrame) -> np.ndarray:
+        return self.intercept + self.encoder.encode(df).dot(self.weights)
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, targets, l2: float = 1.0) -> 'JobScorer':
+        """Fit the weights to target scores (e.g. ratings of past offers) with ridge regression."""
+        encoder = FeatureEncoder(default_vocabularies())
+        X = encoder.encode(df).toarray()
+        y = np.asarray(targets, dtype=float)
+        intercept = y.mean()
+        weights = np.linalg.solve(X.T @ X + l2 * np.eye(X.shape[1]), X.T @ (y - intercept))
+        return cls(dict(zip(encoder.features, weights)), intercept, encoder)
+
+    def to_dict(self) -> dict:
+        return {
+            'intercept': self.intercept,
+            'weights': {feature: weight for feature, weight in zip(self.encoder.features, self.weights.tolist()) if weight}
+        }
+
+    def save(self, path: str = SCORING_MODEL_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str = SCORING_MODEL_PATH) -> 'JobScorer':
+        """Load the model file, or the default weights when there is none yet."""
+        try:
+            with open(path) as f:
+                model = json.load(f)
+        except FileNotFoundError:
+            logger.info(f"No scoring model at {path}, using the default weights")
+            return cls(SCORING_DEFAULT_WEIGHTS)
+        return cls(model.get('weights', {}), model.get('intercept', 0.0))
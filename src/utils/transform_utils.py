@@ -1,73 +1,170 @@
-import os
+import asyncio
+import random
+import re
 import time
+from collections import deque
+from functools import lru_cache
 from typing import Dict, List
 
-from dotenv import load_dotenv
-from src.constants import SECTION_DEFS, SYSTEM_MESSAGE
+from src.constants import (
+    BATCH_SYSTEM_MESSAGE,
+    LLM_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_MODEL,
+    LOCAL_MATCH_MIN_CONFIDENCE,
+    SECTION_DEFS,
+    SYSTEM_MESSAGE
+)
+from src.utils.cache_utils import get_llm_cache
+from src.utils.keyword_utils import get_keyword_matcher
+from src.utils.llm_utils import create_async_llm_client, get_llm_client
 import openai
 from openai import OpenAI
 import logging
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+BATCH_PROMPT_HEADER = (
+    "Each numbered line below is a separate input. Apply the instructions to every line on its own "
+    "and answer with exactly one line per input in the form `<number>. Keyword1,Keyword2`, "
+    "keeping the numbering. Leave the keywords empty if nothing matches.\n"
+)
+BATCH_LINE_PATTERN = re.compile(r'^\s*(\d+)\s*[.:)]\s*(.*)$')
+
+# List markers: dashes and bullet symbols, numbered/lettered items ('1.', '2)', 'a.') and emoji
+BULLET_MARKERS = (
+    r'[•\-*–—·▪▫►▸‣●○◦■□✓✔✗➤➢→>]'
+    r'|(?:\d{1,2}|[a-z])[.)](?=\s)'
+    r'|[\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF]\ufe0f?'
+)
+# Inline header content that is a list ('Python, SQL; Airflow'): two or more items of at most four words
+INLINE_LIST_ITEM = r'[^\s,;!?]+(?:\s[^\s,;!?]+){0,3}'
+INLINE_LIST_PATTERN = re.compile(INLINE_LIST_ITEM + r'(?:\s*[,;]\s*' + INLINE_LIST_ITEM + r')+\.?')
+
+class SectionSplitter:
+    """
+    Splits job descriptions into SECTION_DEFS sections in a single pass over the lines.
+    The header variants are inverted into a header -> section map and compiled, together with
+    the bullet markers, into one regex, so every line is classified by a single match.
+    A header line may carry trailing text ('What we offer you:') or inline content ('Skills: Python, SQL').
+    A header with inline content only opens its section when a bullet list follows it, so a sentence
+    like 'Role: you will join our team...' in running text doesn't move the following items.
+    Without the list, inline content that is itself a short comma-separated list is still kept.
+    """
+    def __init__(self, section_defs: Dict[str, set] = SECTION_DEFS):
+        self.sections = list(section_defs)
+        self.header_map = {header.lower(): section
+                           for section, headers in section_defs.items() for header in headers}
+        # Longest first, so 'key responsibilities' wins over a shorter variant sharing its prefix
+        headers = '|'.join(re.escape(h) for h in sorted(self.header_map, key=len, reverse=True))
+        self.pattern = re.compile(
+            r'^[#*_\s]*(?P<header>' + headers + r')\b'
+            r'(?:(?:[^:\n]{0,40}:)?[*_\s]*$'                    # header line, possibly with a few trailing words
+            r'|\s*[*_]*\s*[:\-–]\s*(?P<inline>\S.*))'           # header followed by its content
+            r'|^(?:' + BULLET_MARKERS + r')\s*(?P<item>\S.*)',
+            re.IGNORECASE
+        )
+
+    def split(self, desc: str) -> Dict[str, List[str]]:
+        sections = {k: [] for k in self.sections}
+        if not isinstance(desc, str):
+            return sections
+        current_section = None
+        matches = [self.pattern.match(line.strip()) for line in desc.splitlines() if line.strip()]
+        for n, match in enumerate(matches):
+            if match is None:
+                continue
+            if match.group('header'):
+                section = self.header_map[match.group('header').lower()]
+                inline = match.group('inline')
+                followed_by_list = n + 1 < len(matches) and matches[n + 1] is not None \
+                    and matches[n + 1].group('item') is not None
+                if inline is None or followed_by_list:
+                    current_section = section
+                if inline and (followed_by_list or INLINE_LIST_PATTERN.fullmatch(inline.strip())):
+                    sections[section].append(inline.strip())
+            elif current_section:
+                sections[current_section].append(match.group('item').strip())
+        return sections
+
+    def split_many(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Split a Series of descriptions, returning a Series of section dicts with the same index.
+        Identical descriptions (reposted offers) are split once.
+        """
+        memo = {}
+        results = []
+        for desc in descriptions:
+            key = desc if isinstance(desc, str) else None
+            if key not in memo:
+                memo[key] = self.split(desc)
+            # Every row gets its own lists, callers may modify them
+            results.append({k: list(v) for k, v in memo[key].items()})
+        return pd.Series(results, index=descriptions.index, dtype=object)
+
+@lru_cache(maxsize=1)
+def get_section_splitter() -> SectionSplitter:
+    """Compile the splitter once per process."""
+    return SectionSplitter(SECTION_DEFS)
+
 def extract_sections(desc: str) -> Dict[str, List[str]]:
     """
     Extract responsibilities, requirements/qualifications and benefits sections from the description
-    using header definitions and bulletpoint detection.
+    using header definitions and bulletpoint detection, see SectionSplitter.
     Args:
         desc (str): The job description.
     Returns:
         sections (Dict[str, List[str]]): Dictionary, where key is one of constants.SECTION_DEFS 
-            and value is a list of lines
+            and value is a list of items, without their bullet markers
     Example:
         desc = \"\"\"
             Qualifications: 
                 * At least 2 years of experience with ETL processes
-                * Knowledge of data warehousing
+                2. Knowledge of data warehousing
             \"\"\"
-        # Output: {'Qualifications': ['At least 2 years of experience with ETL processes', 
-        #           'Knowledge of data warehousing']}
+        # Output: {'requirements': ['At least 2 years of experience with ETL processes', 
+        #           'Knowledge of data warehousing'], ...}
     """
+    return get_section_splitter().split(desc)
 
-    # Define section headers with possible variations
-
-
-    sections = {k: [] for k in SECTION_DEFS}
-    current_section = None
-    bullet_chars = ('•', '-', '*')
-    # A tuple so that str.startswith can parse it
-
-    for line in (l.strip() for l in desc.split('\n')):
-        formatted_line = line.lower().rstrip(':')
-        found_section = next(
-            (section for section, headers in SECTION_DEFS.items()
-             if formatted_line in headers),
-            None
-        )
-
-        if found_section:
-            current_section = found_section
-        elif current_section and line.startswith(bullet_chars):
-            sections[current_section].append(line)
-
-    return sections
+def summarize_locally(original_value, feature_name: str) -> str | None:
+    """
+    Map a cell to keywords with the local KeywordMatcher.
+    Returns the comma-separated keywords, or None when the matcher isn't confident enough
+    and the value should go to the LLM instead.
+    """
+    if isinstance(original_value, str):
+        items = [original_value]
+    elif hasattr(original_value, '__iter__'):
+        items = [str(item) for item in original_value]
+    else:
+        return None
+    keywords, confidence = get_keyword_matcher().summarize(items, feature_name)
+    if keywords and confidence >= LOCAL_MATCH_MIN_CONFIDENCE:
+        logger.debug(f"Local match for '{feature_name}' (confidence {confidence:.2f}): {keywords}")
+        return ', '.join(keywords)
+    return None
 
 class RateLimitedStandardizer:
     """
     Manages state for applying a function (like an API call)
     element-wise with rate limiting.
     """
-    def __init__(self, rpm=15):
+    def __init__(self, rpm=15, use_cache=True, client=None):
         self.rpm = rpm
+        self.client = client
+        self.cache = get_llm_cache() if use_cache else None
         # Use monotonic time for consistent rate calculation
-        self.call_timestamps = []
+        self.call_timestamps = deque()
         logging.info(f"RateLimitedStandardizer initialized with RPM: {self.rpm}")
 
     def _wait_if_needed(self):
         """Checks rate limit and sleeps if necessary."""
         now = time.monotonic()
         # Remove timestamps older than 60 seconds
-        self.call_timestamps = [t for t in self.call_timestamps if now - t < 60]
+        while self.call_timestamps and now - self.call_timestamps[0] >= 60:
+            self.call_timestamps.popleft()
 
         if len(self.call_timestamps) >= self.rpm:
             # Calculate how long until the oldest call expires
@@ -77,7 +174,8 @@ class RateLimitedStandardizer:
             time.sleep(max(0, wait_time) + 0.1) # Sleep until limit allows + small buffer
             # Re-filter timestamps after waiting, as time has passed
             now = time.monotonic()
-            self.call_timestamps = [t for t in self.call_timestamps if now - t < 60]
+            while self.call_timestamps and now - self.call_timestamps[0] >= 60:
+                self.call_timestamps.popleft()
 
     def process_value(self, original_value, feature_name):
         """
@@ -88,26 +186,353 @@ class RateLimitedStandardizer:
         if original_value is None or original_value == []:
             return original_value # Return unchanged
 
-        # --- 2. Handle Rate Limiting ---
-        self._wait_if_needed()
+        # --- 2. Try the local keyword matcher first ---
+        local_value = summarize_locally(original_value, feature_name)
+        if local_value is not None:
+            return local_value
 
-        # --- 3. Prepare input and call external function ---
         input_str = f"{feature_name} {original_value}"
+
+        # --- 3. Serve already seen text from the cache, bypassing the rate limiter ---
+        if self.cache is not None:
+            cached_value = self.cache.get(input_str, SYSTEM_MESSAGE, LLM_MODEL)
+            if cached_value is not None:
+                logger.info(f"Cache hit for feature '{feature_name}'.")
+                return cached_value
+
+        # --- 4. Handle Rate Limiting ---
+        self._wait_if_needed()
+
+        # --- 5. Call external function ---
         logger.info(f"Processing feature '{feature_name}' (rate limit calls = {len(self.call_timestamps)})...")
 
         try:
             # Record timestamp *before* the potentially long call
             self.call_timestamps.append(time.monotonic())
             # THE ACTUAL EXTERNAL CALL
-            processed_value = ai_summarize_list(input_str)
+            processed_value = ai_summarize_list(input_str, use_cache=False, client=self.client)
+            if processed_value is not None and self.cache is not None:
+                self.cache.set(input_str, SYSTEM_MESSAGE, LLM_MODEL, processed_value)
             logger.info(f"Successfully processed feature '{feature_name}'.")
             return processed_value
         except Exception as e:
             logger.error(f"Error processing feature '{feature_name}' with input '{str(input_str)[:100]}...': {e}", exc_info=True)
             # Decide error handling: return original value? None? An error marker?
             return original_value # Example: return original value on error
-        
-def ai_summarize_list(prompt: str) -> str | None:
+
+    def process_batch(self, items: list[tuple]) -> list:
+        """
+        Standardizes many (original_value, feature_name) items with a single API call.
+        Each item is sent on its own numbered line, so the model still sees the category word first,
+        and the answers are mapped back by number, see _process_pending for the retries.
+        Returns:
+            list: Processed values, in the same order as items.
+        """
+        results = [None] * len(items)
+        pending = []
+        for i, (original_value, feature_name) in enumerate(items):
+            if original_value is None or original_value == []:
+                results[i] = original_value
+                continue
+            local_value = summarize_locally(original_value, feature_name)
+            if local_value is not None:
+                results[i] = local_value
+                continue
+            input_str = f"{feature_name} {original_value}"
+            cached_value = self.cache.get(input_str, SYSTEM_MESSAGE, LLM_MODEL) if self.cache is not None else None
+            if cached_value is not None:
+                results[i] = cached_value
+            else:
+                pending.append((i, input_str))
+
+        if pending:
+            self._process_pending(items, pending, results)
+        return results
+
+    def _process_pending(self, items: list[tuple], pending: list[tuple], results: list):
+        """
+        Send the pending (item index, input_str) pairs as one numbered batch and fill results.
+        Items missing from the answer are retried as a smaller batch. An answer that can't be parsed at all
+        is split in halves, down to single items, which go through process_value.
+        A failed request (API, connection or rate limit error) isn't retried, the items keep their original values.
+        """
+        if len(pending) == 1:
+            i = pending[0][0]
+            value = self.process_value(*items[i])
+            results[i] = value if value is not None else items[i][0]
+            return
+
+        self._wait_if_needed()
+        logger.info(f"Processing a batch of {len(pending)} items (rate limit calls = {len(self.call_timestamps)})...")
+        prompt = build_batch_prompt([input_str for _, input_str in pending])
+        response = None
+        try:
+            self.call_timestamps.append(time.monotonic())
+            response = ai_summarize_list(prompt, use_cache=False, client=self.client,
+                                         system_message=BATCH_SYSTEM_MESSAGE)
+        except Exception as e:
+            logger.error(f"Error processing a batch of {len(pending)} items: {e}", exc_info=True)
+        if response is None:
+            logger.warning(f"Request for a batch of {len(pending)} items failed, keeping the original values.")
+            for i, _ in pending:
+                results[i] = items[i][0]
+            return
+        answers = parse_batch_response(response)
+
+        missing = []
+        for n, (i, input_str) in enumerate(pending, start=1):
+            if n in answers:
+                results[i] = answers[n]
+                if self.cache is not None:
+                    self.cache.set(input_str, SYSTEM_MESSAGE, LLM_MODEL, answers[n])
+            else:
+                missing.append((i, input_str))
+
+        if len(missing) == len(pending):
+            half = len(pending) // 2
+            logger.warning(f"Unparseable answer for a batch of {len(pending)} items, retrying it in two halves.")
+            self._process_pending(items, pending[:half], results)
+            self._process_pending(items, pending[half:], results)
+        elif missing:
+            logger.warning(f"Batch answer is missing {len(missing)} of {len(pending)} items, retrying them.")
+            self._process_pending(items, missing, results)
+
+def build_batch_prompt(inputs: list[str]) -> str:
+    """Number the inputs, one per line, under BATCH_PROMPT_HEADER. Send it with BATCH_SYSTEM_MESSAGE."""
+    return BATCH_PROMPT_HEADER + '\n'.join(
+        f"{n}. {input_str}".replace('\n', ' ') for n, input_str in enumerate(inputs, start=1)
+    )
+
+def parse_batch_response(response: str | None) -> dict[int, str]:
+    """
+    Parse a numbered batch answer into {item number: keywords}.
+    Example:
+        response = \"\"\"
+            1. ETL, AWS
+            2: Remote Work
+            \"\"\"
+        # Output: {1: 'ETL, AWS', 2: 'Remote Work'}
+    """
+    answers = {}
+    if not response:
+        return answers
+    for line in response.splitlines():
+        match = BATCH_LINE_PATTERN.match(line)
+        if match:
+            answers[int(match.group(1))] = match.group(2).strip()
+    return answers
+
+class TokenBucket:
+    """
+    Asyncio token bucket refilled continuously at rate_per_minute.
+    capacity is the burst allowed on top of the rate, one token by default, so the first minute
+    doesn't get a full minute of budget up front. A request larger than the capacity waits for a full
+    bucket and leaves it in debt, so it still counts in full against the rate.
+    pause() empties the bucket and blocks it for a while, e.g. when the API returns Retry-After.
+    """
+    def __init__(self, rate_per_minute: float, capacity: float = 1):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        """Wait until amount tokens (at most the capacity) are available and take amount."""
+        needed = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait_time = self.blocked_until - now
+                if wait_time <= 0:
+                    if self.tokens >= needed:
+                        self.tokens -= amount
+                        return
+                    wait_time = (needed - self.tokens) / self.rate
+                await asyncio.sleep(wait_time)
+
+    def pause(self, seconds: float):
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+class AsyncRateLimitedStandardizer:
+    """
+    Asyncio counterpart of RateLimitedStandardizer.
+    Keeps up to `concurrency` requests in flight while staying within the RPM and TPM budgets,
+    honours Retry-After on 429 responses and retries transient errors with exponential backoff.
+    """
+    def __init__(self, rpm=15, tpm=1_000_000, concurrency=LLM_CONCURRENCY, max_retries=LLM_MAX_RETRIES,
+                 use_cache=True, client=None):
+        self.requests = TokenBucket(rpm)
+        # A few seconds of the token budget, enough for the first requests of a run to start together
+        self.tokens = TokenBucket(tpm, capacity=tpm / 60 * 5)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.cache = get_llm_cache() if use_cache else None
+        self._client = client
+        self._owns_client = client is None
+        logging.info(f"AsyncRateLimitedStandardizer initialized with RPM: {rpm}, TPM: {tpm}, concurrency: {concurrency}")
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = create_async_llm_client()
+        return self._client
+
+    async def _complete(self, prompt: str, system_message: str = SYSTEM_MESSAGE) -> str | None:
+        """Send one prompt within the rate budgets, retrying 429s and transient errors."""
+        # Rough estimate, ~4 characters per token
+        estimated_tokens = (len(system_message) + len(prompt)) // 4
+        for attempt in range(self.max_retries + 1):
+            await self.requests.acquire()
+            await self.tokens.acquire(estimated_tokens)
+            try:
+                response = await self.client.chat.completions.create(
+                    model=LLM_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_message},
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                return response.choices[0].message.content
+            except openai.RateLimitError as e:
+                delay = _retry_after(e) or 2 ** attempt
+                self.requests.pause(delay)
+                logger.warning(f"OpenAI API request exceeded rate limit, retrying in {delay:.1f}s: {e}")
+            except (openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError) as e:
+                delay = 2 ** attempt + random.random()
+                logger.warning(f"Transient OpenAI API error, retrying in {delay:.1f}s: {e}")
+            except openai.APIError as e:
+                logger.warning(f"OpenAI API returned an API Error: {e}")
+                return None
+            except Exception as e:
+                # E.g. the client can't be created (missing API key): the items keep their original values
+                logger.error(f"Error sending a prompt to the OpenAI API: {e}", exc_info=True)
+                return None
+            if attempt < self.max_retries:
+                await asyncio.sleep(delay)
+        logger.error(f"Giving up after {self.max_retries} retries.")
+        return None
+
+    async def process_batch(self, items: list[tuple]) -> list:
+        """
+        Standardizes (original_value, feature_name) items with one request.
+        A single uncached item is sent as a plain prompt, several are sent as a numbered batch,
+        see _process_pending for the retries.
+        """
+        results = [None] * len(items)
+        pending = []
+        for i, (original_value, feature_name) in enumerate(items):
+            if original_value is None or original_value == []:
+                results[i] = original_value
+                continue
+            local_value = summarize_locally(original_value, feature_name)
+            if local_value is not None:
+                results[i] = local_value
+                continue
+            input_str = f"{feature_name} {original_value}"
+            cached_value = self.cache.get(input_str, SYSTEM_MESSAGE, LLM_MODEL) if self.cache is not None else None
+            if cached_value is not None:
+                results[i] = cached_value
+            else:
+                pending.append((i, input_str))
+
+        if pending:
+            await self._process_pending(items, pending, results)
+        return results
+
+    async def _process_pending(self, items: list[tuple], pending: list[tuple], results: list):
+        """
+        Send the pending (item index, input_str) pairs as one request and fill results.
+        Items missing from a batch answer are retried as a smaller batch. An answer that can't be parsed at all
+        is split in halves, down to single items. A request that failed after _complete()'s retries isn't
+        split, its items keep their original values, as does a single item that gets no answer.
+        """
+        if len(pending) == 1:
+            response = await self._complete(pending[0][1])
+            answers = {1: response} if response is not None else {}
+        else:
+            response = await self._complete(build_batch_prompt([s for _, s in pending]), BATCH_SYSTEM_MESSAGE)
+            if response is None:
+                logger.warning(f"Request for a batch of {len(pending)} items failed, keeping the original values.")
+                for i, _ in pending:
+                    results[i] = items[i][0]
+                return
+            answers = parse_batch_response(response)
+
+        missing = []
+        for n, (i, input_str) in enumerate(pending, start=1):
+            if n in answers:
+                results[i] = answers[n]
+                if self.cache is not None:
+                    self.cache.set(input_str, SYSTEM_MESSAGE, LLM_MODEL, answers[n])
+            else:
+                missing.append((i, input_str))
+
+        if len(pending) == 1:
+            if missing:
+                logger.warning(f"No answer for '{pending[0][1][:100]}...', keeping the original value.")
+                results[pending[0][0]] = items[pending[0][0]][0]
+        elif len(missing) == len(pending):
+            half = len(pending) // 2
+            logger.warning(f"Unparseable answer for a batch of {len(pending)} items, retrying it in two halves.")
+            await self._process_pending(items, pending[:half], results)
+            await self._process_pending(items, pending[half:], results)
+        elif missing:
+            logger.warning(f"Batch answer is missing {len(missing)} of {len(pending)} items, retrying them.")
+            await self._process_pending(items, missing, results)
+
+    async def process_batches(self, batches: list[list[tuple]]) -> list[list]:
+        """
+        Process all batches concurrently, at most `concurrency` at a time. Results keep the input order.
+        The items of a batch that raised are retried one at a time, the other batches are unaffected.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(batch):
+            async with semaphore:
+                return await self.process_batch(batch)
+
+        try:
+            results = await asyncio.gather(*(bounded(batch) for batch in batches), return_exceptions=True)
+            for n, (batch, result) in enumerate(zip(batches, results)):
+                if isinstance(result, BaseException):
+                    if not isinstance(result, Exception):
+                        raise result
+                    logger.error(f"Error processing a batch of {len(batch)} items, retrying them one at a time: "
+                                 f"{result}", exc_info=result)
+                    results[n] = [await self._process_single(item) for item in batch]
+            return results
+        finally:
+            if self._owns_client and self._client is not None:
+                await self._client.close()
+                self._client = None
+
+    async def _process_single(self, item: tuple):
+        """Standardize one (original_value, feature_name) item, keeping the original value if it raises."""
+        try:
+            return (await self.process_batch([item]))[0]
+        except Exception as e:
+            logger.error(f"Error processing '{str(item[0])[:100]}...', keeping the original value: {e}", exc_info=True)
+            return item[0]
+
+def _retry_after(error: openai.APIStatusError) -> float | None:
+    """Read the Retry-After header (in seconds) of an API error, if present."""
+    try:
+        return float(error.response.headers.get('retry-after'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def ai_summarize_list(prompt: str, use_cache: bool = True, client: OpenAI | None = None,
+                      system_message: str = SYSTEM_MESSAGE) -> str | None:
     """
     Summarizes a list of job posting items into keywords using LLM.
     Some job postings do not have the relevant sections, and details are found in the description.
@@ -117,6 +542,9 @@ def ai_summarize_list(prompt: str) -> str | None:
     See constants.py for the system instructions.
     Args:
         prompt (str): String with pre-processed items. This may be any of the 3 categories.
+        use_cache (bool): Look the prompt up in the local LLM cache first and store new responses there.
+        client (OpenAI | None): Client to use, defaults to the shared pooled client from get_llm_client().
+        system_message (str): System instructions, BATCH_SYSTEM_MESSAGE for numbered multi-item prompts.
     Returns:
         list: A list of keywords summarizing the input list.
     Raises:
@@ -131,16 +559,18 @@ def ai_summarize_list(prompt: str) -> str | None:
         summarized_list = ai_summarize_list(input_list)
         # Output: ['ETL', 'Data Warehousing', 'Health Insurance']
     """
-    load_dotenv()
-    client = OpenAI(
-        api_key=os.getenv('GEMINI_API_KEY'),
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
+    cache = get_llm_cache() if use_cache else None
+    if cache is not None:
+        cached_response = cache.get(prompt, system_message, LLM_MODEL)
+        if cached_response is not None:
+            return cached_response
+
+    client = client or get_llm_client()
     try:
         response = client.chat.completions.create(
-            model="gemini-2.0-flash",
+            model=LLM_MODEL,
             messages=[
-                {"role": "system", "content": SYSTEM_MESSAGE},
+                {"role": "system", "content": system_message},
                 {
                     "role": "user",
                     "content": prompt
@@ -148,7 +578,10 @@ def ai_summarize_list(prompt: str) -> str | None:
             ]
         )
 
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        if cache is not None and content is not None:
+            cache.set(prompt, system_message, LLM_MODEL, content)
+        return content
     except openai.APIError as e:
         #Handle API error here, e.g. retry or log
         logger.warning(f"OpenAI API returned an API Error: {e}")
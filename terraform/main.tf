@@ -74,6 +74,10 @@ resource "docker_container" "airflow_webserver" {
     host_path      = abspath("${path.cwd}/../logs")
     container_path = "/opt/airflow/logs"
   }
+  volumes {
+    host_path      = abspath("${path.cwd}/../data")
+    container_path = "/opt/airflow/data"
+  }
   # Sometimes you get an error with 'sheduler not running'
   depends_on = [docker_container.postgresql, docker_container.airflow_scheduler]
   command = ["webserver"]
@@ -115,6 +119,10 @@ resource "docker_container" "airflow_scheduler" {
     host_path      = abspath("${path.cwd}/../logs")
     container_path = "/opt/airflow/logs"
   }
+  volumes {
+    host_path      = abspath("${path.cwd}/../data")
+    container_path = "/opt/airflow/data"
+  }
   depends_on = [docker_container.postgresql]
   command = ["scheduler"]
 }